@@ -0,0 +1,37 @@
+"""Add threats_hourly_counts table for rolling event counters
+
+Revision ID: a3f1c7d92b4e
+Revises: 785d812e2ea3
+Create Date: 2026-10-15 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c7d92b4e'
+down_revision: Union[str, None] = '785d812e2ea3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('threats_hourly_counts',
+        sa.Column('hour_bucket', sa.DateTime(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('hour_bucket')
+    )
+
+    # Backfill counters from events already stored
+    op.execute(
+        "INSERT INTO threats_hourly_counts (hour_bucket, count) "
+        "SELECT strftime('%Y-%m-%d %H:00:00.000000', timestamp), COUNT(*) "
+        "FROM threats_events GROUP BY 1"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('threats_hourly_counts')
@@ -0,0 +1,33 @@
+"""Replace ignored index with composite (ignored, timestamp) index
+
+Revision ID: 5be08d4a17c3
+Revises: a3f1c7d92b4e
+Create Date: 2026-10-15 09:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5be08d4a17c3'
+down_revision: Union[str, None] = 'a3f1c7d92b4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The single-column boolean index made the planner scan every
+    # non-ignored event for time-window counts and sort them for listings
+    with op.batch_alter_table('threats_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_threats_events_ignored')
+        batch_op.create_index(
+            'ix_threats_events_ignored_timestamp', ['ignored', 'timestamp'], unique=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('threats_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_threats_events_ignored_timestamp')
+        batch_op.create_index('ix_threats_events_ignored', ['ignored'], unique=False)
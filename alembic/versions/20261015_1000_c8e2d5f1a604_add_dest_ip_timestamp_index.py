@@ -0,0 +1,31 @@
+"""Add composite (dest_ip, timestamp) index on threats_events
+
+Revision ID: c8e2d5f1a604
+Revises: 5be08d4a17c3
+Create Date: 2026-10-15 10:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2d5f1a604'
+down_revision: Union[str, None] = '5be08d4a17c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Mirrors ix_threats_events_src_ip_timestamp so the destination half of
+    # the per-IP event query can be read in timestamp order
+    with op.batch_alter_table('threats_events', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_threats_events_dest_ip_timestamp', ['dest_ip', 'timestamp'], unique=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('threats_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_threats_events_dest_ip_timestamp')
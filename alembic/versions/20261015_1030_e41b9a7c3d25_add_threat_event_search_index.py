@@ -0,0 +1,61 @@
+"""Add FTS5 trigram search index for threat event signature/message
+
+Revision ID: e41b9a7c3d25
+Revises: c8e2d5f1a604
+Create Date: 2026-10-15 10:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41b9a7c3d25'
+down_revision: Union[str, None] = 'c8e2d5f1a604'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # External-content FTS5 table: stores only the trigram index, the text
+    # itself stays in threats_events
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS threats_events_search USING fts5("
+        "signature, message, content='threats_events', content_rowid='id', tokenize='trigram')"
+    )
+
+    # Keep the index in sync with threats_events
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS threats_events_search_ai "
+        "AFTER INSERT ON threats_events BEGIN "
+        "INSERT INTO threats_events_search(rowid, signature, message) "
+        "VALUES (new.id, new.signature, new.message); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS threats_events_search_ad "
+        "AFTER DELETE ON threats_events BEGIN "
+        "INSERT INTO threats_events_search(threats_events_search, rowid, signature, message) "
+        "VALUES ('delete', old.id, old.signature, old.message); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS threats_events_search_au "
+        "AFTER UPDATE OF signature, message ON threats_events BEGIN "
+        "INSERT INTO threats_events_search(threats_events_search, rowid, signature, message) "
+        "VALUES ('delete', old.id, old.signature, old.message); "
+        "INSERT INTO threats_events_search(rowid, signature, message) "
+        "VALUES (new.id, new.signature, new.message); "
+        "END"
+    )
+
+    # Index events already stored
+    op.execute("INSERT INTO threats_events_search(threats_events_search) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS threats_events_search_au")
+    op.execute("DROP TRIGGER IF EXISTS threats_events_search_ad")
+    op.execute("DROP TRIGGER IF EXISTS threats_events_search_ai")
+    op.execute("DROP TABLE IF EXISTS threats_events_search")
@@ -0,0 +1,46 @@
+"""Replace single-column filter indexes with (ignored, column, timestamp) composites
+
+Revision ID: 7d4b0e9f2a61
+Revises: e41b9a7c3d25
+Create Date: 2026-10-15 11:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4b0e9f2a61'
+down_revision: Union[str, None] = 'e41b9a7c3d25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FILTER_COLUMNS = ['severity', 'category', 'action', 'src_ip', 'dest_ip']
+
+# Single-column indexes superseded by the composites (action never had one)
+REPLACED_COLUMNS = ['severity', 'category', 'src_ip', 'dest_ip']
+
+
+def upgrade() -> None:
+    # The event list filters on ignored plus one column and orders by
+    # timestamp; with only single-column indexes the planner walked the
+    # (ignored, timestamp) index and filtered every row, or sorted the matches
+    with op.batch_alter_table('threats_events', schema=None) as batch_op:
+        for column in REPLACED_COLUMNS:
+            batch_op.drop_index(f'ix_threats_events_{column}')
+        for column in FILTER_COLUMNS:
+            batch_op.create_index(
+                f'ix_threats_events_ignored_{column}_timestamp',
+                ['ignored', column, 'timestamp'],
+                unique=False
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('threats_events', schema=None) as batch_op:
+        for column in FILTER_COLUMNS:
+            batch_op.drop_index(f'ix_threats_events_ignored_{column}_timestamp')
+        for column in REPLACED_COLUMNS:
+            batch_op.create_index(f'ix_threats_events_{column}', [column], unique=False)
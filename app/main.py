@@ -437,5 +437,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=settings.app_port,
         reload=False,
-        log_level=log_level
+        log_level=log_level,
+        # Broadcasts share one encoded payload; per-connection compression would
+        # re-compress it for every client
+        ws_per_message_deflate=False
     )
@@ -90,7 +90,7 @@ async def save_unifi_config(
     import logging
     logger = logging.getLogger(__name__)
     from shared import cache
-    from shared.unifi_session import invalidate_shared_client
+    from shared.unifi_session import invalidate_shared_client, invalidate_client_settings
 
     try:
         # Validate that either password or API key is provided
@@ -150,6 +150,8 @@ async def save_unifi_config(
 
         logger.debug("Committing to database...")
         await db.commit()
+        # Drop settings a concurrent request may have cached before the commit
+        invalidate_client_settings()
         logger.info("UniFi configuration saved successfully")
 
         return SuccessResponse(
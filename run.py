@@ -258,5 +258,8 @@ if __name__ == "__main__":
         port=settings.app_port,
         reload=False,  # Set to True for development
         log_level=log_level,
+        # Broadcasts share one encoded payload; per-connection compression would
+        # re-compress it for every client
+        ws_per_message_deflate=False,
         access_log=True
     )
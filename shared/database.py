@@ -11,6 +11,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Compiled SQL cache entries per engine (SQLAlchemy defaults to 500). The
+# threat event endpoints build one statement shape per filter combination,
+# so a larger cache keeps them from evicting each other
+QUERY_CACHE_SIZE = 1200
+
 
 class Database:
     """
@@ -44,7 +49,8 @@ class Database:
         # Create async engine
         self.engine = create_async_engine(
             settings.database_url,
-            echo=settings.log_level.upper() == "DEBUG"
+            echo=settings.log_level.upper() == "DEBUG",
+            query_cache_size=QUERY_CACHE_SIZE
         )
 
         # Create session factory
@@ -2,6 +2,7 @@
 UniFi API client wrapper using aiounifi
 """
 from typing import Optional, Dict, List
+import asyncio
 import aiohttp
 from aiounifi.controller import Controller
 from aiounifi.models.configuration import Configuration
@@ -1528,10 +1529,14 @@ class UniFiClient:
 
         return result
 
-    async def test_connection(self) -> Dict:
+    async def test_connection(self, probe_ips: bool = False) -> Dict:
         """
         Test the connection to the UniFi controller
 
+        Args:
+            probe_ips: Also check whether IPS events can be fetched, reported
+                as "ips_events_available"
+
         Returns:
             Dictionary with connection status and controller info
         """
@@ -1543,16 +1548,25 @@ class UniFiClient:
                     "error": "Failed to connect to UniFi controller"
                 }
 
-            # Get controller info
-            clients = await self.get_clients()
-            aps = await self.get_access_points()
+            # Get controller info (and probe IPS events) over the one login
+            lookups = [self.get_clients(), self.get_access_points()]
+            if probe_ips:
+                lookups.append(self.get_ips_events(limit=1))
+            clients, aps, *ips_probe = await asyncio.gather(*lookups, return_exceptions=True)
+            for fetched in (clients, aps):
+                if isinstance(fetched, Exception):
+                    raise fetched
 
-            return {
+            result = {
                 "connected": True,
                 "client_count": len(clients),
                 "ap_count": len(aps),
                 "site": self.site
             }
+            if probe_ips:
+                # If the probe didn't raise, IPS events are available
+                result["ips_events_available"] = not isinstance(ips_probe[0], Exception)
+            return result
 
         except Exception as e:
             logger.error(f"Connection test failed: {e}")
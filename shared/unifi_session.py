@@ -9,10 +9,12 @@ The client initializes lazily on the first scheduler call and reconnects
 automatically if the session goes stale. Config changes (via the web UI)
 invalidate the shared client so the next poll picks up new credentials.
 """
+import asyncio
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared.database import get_database
 from shared.models.unifi_config import UniFiConfig
@@ -24,6 +26,78 @@ logger = logging.getLogger(__name__)
 # Singleton client instance
 _shared_client: Optional[UniFiClient] = None
 
+# Decrypted connection settings (UniFiClient keyword arguments), cached so
+# request-scoped clients don't re-read and re-decrypt the config every call
+_client_settings: Optional[Dict[str, Any]] = None
+_client_settings_lock = asyncio.Lock()
+# Bumped on every invalidation so a lookup that raced a config save can tell
+# its result is stale
+_client_settings_generation = 0
+
+
+def decrypt_client_settings(unifi_config: UniFiConfig) -> Dict[str, Any]:
+    """Build UniFiClient keyword arguments from a config row, decrypting credentials"""
+    password = None
+    api_key = None
+
+    if unifi_config.password_encrypted:
+        password = decrypt_password(unifi_config.password_encrypted)
+    if unifi_config.api_key_encrypted:
+        api_key = decrypt_api_key(unifi_config.api_key_encrypted)
+
+    return {
+        "host": unifi_config.controller_url,
+        "username": unifi_config.username,
+        "password": password,
+        "api_key": api_key,
+        "site": unifi_config.site_id,
+        "verify_ssl": unifi_config.verify_ssl,
+    }
+
+
+async def get_client_settings(session: AsyncSession) -> Optional[Dict[str, Any]]:
+    """
+    Get decrypted UniFi connection settings, hitting the DB only on a cache miss.
+
+    Args:
+        session: Database session used to load the config on a cache miss
+
+    Returns:
+        Dict of UniFiClient keyword arguments, or None if no config is saved
+
+    Raises:
+        Exception: If the stored credentials cannot be decrypted
+    """
+    global _client_settings
+
+    if _client_settings is not None:
+        return _client_settings
+
+    async with _client_settings_lock:
+        if _client_settings is not None:
+            return _client_settings
+
+        generation = _client_settings_generation
+        unifi_config = await session.scalar(select(UniFiConfig).where(UniFiConfig.id == 1))
+        if not unifi_config:
+            return None
+
+        settings = await asyncio.to_thread(decrypt_client_settings, unifi_config)
+
+        # A save committed while we were reading/decrypting; use the result
+        # for this call only and let the next lookup load the new config
+        if generation == _client_settings_generation:
+            _client_settings = settings
+
+    return settings
+
+
+def invalidate_client_settings():
+    """Drop the cached connection settings so the next lookup re-reads the DB"""
+    global _client_settings, _client_settings_generation
+    _client_settings = None
+    _client_settings_generation += 1
+
 
 async def get_shared_client() -> Optional[UniFiClient]:
     """
@@ -103,13 +177,15 @@ async def get_shared_client() -> Optional[UniFiClient]:
 
 async def invalidate_shared_client():
     """
-    Disconnect and clear the shared client.
+    Disconnect and clear the shared client and cached connection settings.
 
     Called when UniFi config is saved via the web UI so the next scheduler
     run creates a fresh client with the updated credentials.
     """
     global _shared_client
 
+    invalidate_client_settings()
+
     if _shared_client is not None:
         logger.info("Invalidating shared UniFi session (config changed)")
         try:
@@ -2,31 +2,137 @@
 WebSocket connection manager for real-time device updates
 """
 from fastapi import WebSocket
-from typing import List
-import json
+from typing import Dict, Set
+import asyncio
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of pending messages per client before it is considered
+# too slow and dropped
+CLIENT_QUEUE_SIZE = 64
+
+# Maximum time (seconds) a single send may block on a saturated connection
+# before the client is dropped
+WS_SEND_TIMEOUT = 2.0
+
+# Close code sent to dropped clients so their dashboards reconnect
+WS_CLOSE_CODE_DROPPED = 1011
+
+
+class ClientSession:
+    """
+    A connected WebSocket client with its own outbound queue and writer task
+    """
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.task: asyncio.Task = None
+
 
 class WebSocketManager:
     """
     Manages WebSocket connections and broadcasts device updates
+
+    Each client gets a dedicated writer task fed by a bounded queue, so a
+    broadcast only enqueues the payload and a slow client can never hold up
+    the others.
     """
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Dict[WebSocket, ClientSession] = {}
+        self._close_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def has_connections(self) -> bool:
+        """Whether any clients are connected (lets callers skip building payloads)"""
+        return bool(self.active_connections)
 
     async def connect(self, websocket: WebSocket):
         """Accept and register a new WebSocket connection"""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        session = ClientSession(websocket)
+        session.task = asyncio.create_task(self._writer(session))
+        self.active_connections[websocket] = session
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
-        """Remove a WebSocket connection"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
+        """Remove a WebSocket connection and stop its writer task"""
+        session = self.active_connections.pop(websocket, None)
+        if session is None:
+            return
+
+        if session.task is not None and session.task is not asyncio.current_task():
+            session.task.cancel()
+        logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
+
+    async def _close(self, websocket: WebSocket):
+        """
+        Close a dropped client's socket so the browser notices and reconnects
+
+        Args:
+            websocket: Connection that was removed from active_connections
+        """
+        try:
+            await asyncio.wait_for(websocket.close(code=WS_CLOSE_CODE_DROPPED), WS_SEND_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Error closing dropped WebSocket: {e}")
+
+    async def _drop(self, websocket: WebSocket):
+        """Stop tracking a failed client and close its connection"""
+        self.disconnect(websocket)
+        await self._close(websocket)
+
+    async def _writer(self, session: ClientSession):
+        """
+        Send queued messages to a single client until it disconnects
+
+        Args:
+            session: Client session to drain
+        """
+        while True:
+            payload = await session.queue.get()
+            try:
+                await asyncio.wait_for(session.websocket.send_bytes(payload), WS_SEND_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("WebSocket send timed out, dropping connection")
+                await self._drop(session.websocket)
+                return
+            except Exception as e:
+                logger.error(f"Error sending to WebSocket: {e}")
+                await self._drop(session.websocket)
+                return
+            finally:
+                session.queue.task_done()
+
+    async def _broadcast(self, message: dict):
+        """
+        Queue a message for all connected clients
+
+        The message is encoded once and the same bytes are handed to every
+        client's writer as a binary frame (the dashboards decode it back to
+        JSON). Clients whose queue is full are dropped.
+
+        Args:
+            message: Dictionary to send as JSON
+        """
+        payload = orjson.dumps(message)
+
+        disconnected = []
+        for session in list(self.active_connections.values()):
+            try:
+                session.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                logger.warning("WebSocket client too slow, dropping connection")
+                disconnected.append(session.websocket)
+
+        # Remove slow clients; closing may block on their saturated socket,
+        # so it runs in the background instead of holding up the broadcast
+        for websocket in disconnected:
+            self.disconnect(websocket)
+            task = asyncio.create_task(self._close(websocket))
+            self._close_tasks.add(task)
+            task.add_done_callback(self._close_tasks.discard)
 
     async def broadcast_device_update(self, device_data: dict):
         """
@@ -38,23 +144,10 @@ class WebSocketManager:
         if not self.active_connections:
             return
 
-        message = {
+        await self._broadcast({
             "type": "device_update",
             "device": device_data
-        }
-
-        # Send to all connected clients
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending to WebSocket: {e}")
-                disconnected.append(connection)
-
-        # Remove disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection)
+        })
 
     async def broadcast(self, data: dict):
         """
@@ -66,16 +159,7 @@ class WebSocketManager:
         if not self.active_connections:
             return
 
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(data)
-            except Exception as e:
-                logger.error(f"Error sending to WebSocket: {e}")
-                disconnected.append(connection)
-
-        for connection in disconnected:
-            self.disconnect(connection)
+        await self._broadcast(data)
 
     async def broadcast_status_update(self, status_data: dict):
         """
@@ -87,23 +171,10 @@ class WebSocketManager:
         if not self.active_connections:
             return
 
-        message = {
+        await self._broadcast({
             "type": "status_update",
             "status": status_data
-        }
-
-        # Send to all connected clients
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending to WebSocket: {e}")
-                disconnected.append(connection)
-
-        # Remove disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection)
+        })
 
 
 # Global WebSocket manager instance
@@ -0,0 +1,63 @@
+"""Tests for Threat Watch response cache."""
+import time
+
+from tools.threat_watch import response_cache
+
+
+class TestResponseCache:
+    """Tests for TTL-based response caching."""
+
+    def setup_method(self):
+        """Clear cache before each test."""
+        response_cache.invalidate_all()
+
+    def test_get_cached_returns_none_when_empty(self):
+        """Should return None for unknown keys."""
+        assert response_cache.get_cached("status") is None
+
+    def test_set_cached_stores_value(self):
+        """Should return the cached value within its TTL."""
+        response_cache.set_cached("status", {"total_events": 3}, 60)
+        assert response_cache.get_cached("status") == {"total_events": 3}
+
+    def test_cached_value_expires_after_ttl(self):
+        """Should drop entries once their TTL has passed."""
+        response_cache.set_cached("status", {"total_events": 3}, 60)
+
+        # Manually expire the cache entry
+        _, value = response_cache._cache["status"]
+        response_cache._cache["status"] = (time.monotonic() - 1, value)
+
+        assert response_cache.get_cached("status") is None
+        assert "status" not in response_cache._cache
+
+    def test_invalidate_all_clears_entries(self):
+        """Should clear every cached response."""
+        response_cache.set_cached("status", {"total_events": 3}, 60)
+        response_cache.set_cached("other", [1, 2], 60)
+
+        response_cache.invalidate_all()
+
+        assert response_cache.get_cached("status") is None
+        assert response_cache.get_cached("other") is None
+
+    def test_invalidate_drops_only_that_key(self):
+        """Should drop one entry and keep the rest and the ETag."""
+        response_cache.set_cached("status", {"total_events": 3}, 60)
+        response_cache.set_cached("categories", ["scan"], 60)
+        tag = response_cache.etag()
+
+        response_cache.invalidate("status")
+
+        assert response_cache.get_cached("status") is None
+        assert response_cache.get_cached("categories") == ["scan"]
+        assert response_cache.etag() == tag
+
+    def test_etag_is_stable_until_invalidated(self):
+        """Should return the same ETag until the cache is invalidated."""
+        first = response_cache.etag()
+        assert response_cache.etag() == first
+
+        response_cache.invalidate_all()
+
+        assert response_cache.etag() != first
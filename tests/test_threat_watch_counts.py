@@ -0,0 +1,124 @@
+"""Tests for Threat Watch per-hour event counters and the status totals."""
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select
+
+from shared.database import get_db_session
+from tools.threat_watch import main as threat_main
+from tools.threat_watch import response_cache
+from tools.threat_watch.database import ThreatEvent, ThreatHourlyCount
+from tools.threat_watch.scheduler import (
+    backfill_hourly_counts, hour_bucket, increment_hourly_counts
+)
+
+# Fixed clock for the status endpoint: the 24h window starts at 12:30 the
+# day before, half way through its first hour bucket
+NOW = datetime(2026, 10, 15, 12, 30, tzinfo=timezone.utc)
+
+EVENT_TIMES = [
+    datetime(2026, 10, 12, 8, 0, tzinfo=timezone.utc),    # days ago
+    datetime(2026, 10, 14, 12, 15, tzinfo=timezone.utc),  # boundary hour, before the window
+    datetime(2026, 10, 14, 12, 45, tzinfo=timezone.utc),  # boundary hour, inside the window
+    datetime(2026, 10, 14, 18, 0, tzinfo=timezone.utc),   # full hour
+    datetime(2026, 10, 15, 12, 5, tzinfo=timezone.utc),   # current hour
+]
+
+
+class FixedDatetime(datetime):
+    """datetime whose now() returns NOW."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return NOW.astimezone(tz) if tz else NOW.replace(tzinfo=None)
+
+
+async def add_events(session, times):
+    """Store one event per timestamp."""
+    for i, timestamp in enumerate(times):
+        session.add(ThreatEvent(unifi_event_id=str(i), timestamp=timestamp))
+    await session.commit()
+
+
+class TestHourBucket:
+    """Tests for truncating timestamps to their hour."""
+
+    def test_naive_timestamp_is_truncated(self):
+        """Should drop minutes, seconds and microseconds."""
+        assert hour_bucket(datetime(2026, 10, 15, 9, 59, 59, 999999)) == datetime(2026, 10, 15, 9)
+
+    def test_aware_timestamp_is_converted_to_naive_utc(self):
+        """Should convert to UTC before truncating and drop tzinfo."""
+        cest = timezone(timedelta(hours=2))
+        bucket = hour_bucket(datetime(2026, 10, 15, 1, 30, tzinfo=cest))
+
+        assert bucket == datetime(2026, 10, 14, 23)
+        assert bucket.tzinfo is None
+
+
+class TestHourlyCounts:
+    """Tests for maintaining and backfilling the counters."""
+
+    async def test_increment_adds_to_existing_buckets(self, test_db):
+        """Should create new buckets and add to existing ones."""
+        await increment_hourly_counts(test_db, Counter({datetime(2026, 10, 15, 9): 2}))
+        await test_db.commit()
+        await increment_hourly_counts(test_db, Counter({
+            datetime(2026, 10, 15, 9): 3,
+            datetime(2026, 10, 15, 10): 1,
+        }))
+        await test_db.commit()
+
+        rows = (await test_db.execute(
+            select(ThreatHourlyCount.hour_bucket, ThreatHourlyCount.count)
+            .order_by(ThreatHourlyCount.hour_bucket)
+        )).all()
+        assert rows == [(datetime(2026, 10, 15, 9), 5), (datetime(2026, 10, 15, 10), 1)]
+
+    async def test_backfill_fills_empty_counters(self, test_db):
+        """Should rebuild the counters from stored events when the table is empty."""
+        await add_events(test_db, EVENT_TIMES)
+
+        assert await backfill_hourly_counts(test_db) == 4
+
+        counts = dict((await test_db.execute(
+            select(ThreatHourlyCount.hour_bucket, ThreatHourlyCount.count)
+        )).all())
+        assert counts[datetime(2026, 10, 14, 12)] == 2
+        assert sum(counts.values()) == len(EVENT_TIMES)
+
+    async def test_backfill_leaves_existing_counters_alone(self, test_db):
+        """Should not touch counters that are already maintained."""
+        await add_events(test_db, EVENT_TIMES)
+        await increment_hourly_counts(test_db, Counter({datetime(2026, 10, 15, 12): 1}))
+        await test_db.commit()
+
+        assert await backfill_hourly_counts(test_db) == 0
+
+
+class TestStatusTotals:
+    """Tests for the /api/status event totals."""
+
+    @pytest.fixture
+    async def client(self, test_db, monkeypatch):
+        """Threat Watch app using the test database and a fixed clock."""
+        monkeypatch.setattr(threat_main, "datetime", FixedDatetime)
+        response_cache.invalidate_all()
+
+        app = threat_main.create_app()
+        app.dependency_overrides[get_db_session] = lambda: test_db
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+        response_cache.invalidate_all()
+
+    async def test_status_counts_full_hours_and_boundary_hour(self, test_db, client):
+        """Should match an exact count of events in the last 24 hours."""
+        await add_events(test_db, EVENT_TIMES)
+        await backfill_hourly_counts(test_db)
+
+        status = (await client.get("/api/status")).json()
+
+        assert status["total_events"] == 5
+        assert status["events_24h"] == 3
@@ -0,0 +1,473 @@
+"""Tests for Threat Watch event storage and the event list API."""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from shared.database import get_db_session
+from shared.models.base import Base
+from tools.threat_watch import database as threat_db
+from tools.threat_watch import response_cache
+from tools.threat_watch.database import ThreatEvent
+from tools.threat_watch.main import create_app
+from tools.threat_watch.routers.events import _decode_cursor, _encode_cursor
+
+ATTACKER = "203.0.113.5"
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    """File-backed engine so the schema persists across connections."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'threats.db'}")
+    yield engine
+    await engine.dispose()
+
+
+async def insert_event(conn, event_id: str, signature: str):
+    """Insert a minimal threat event."""
+    await conn.execute(ThreatEvent.__table__.insert().values(
+        unifi_event_id=event_id,
+        timestamp=datetime(2026, 10, 15, 12, 0, tzinfo=timezone.utc),
+        signature=signature,
+    ))
+
+
+async def search(conn, phrase: str) -> list:
+    """Return unifi_event_ids whose signature/message contains phrase."""
+    result = await conn.execute(
+        select(ThreatEvent.unifi_event_id)
+        .where(ThreatEvent.id.in_(text(
+            "SELECT rowid FROM threats_events_search WHERE threats_events_search MATCH :phrase"
+        ).bindparams(phrase=f'"{phrase}"')))
+        .order_by(ThreatEvent.unifi_event_id)
+    )
+    return list(result.scalars())
+
+
+class TestSearchIndex:
+    """Tests for the trigram search index setup."""
+
+    async def test_index_tracks_inserted_events(self, engine):
+        """Events inserted after create_all should be searchable."""
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await insert_event(conn, "1", "ET SCAN Nmap Scripting Engine")
+            await insert_event(conn, "2", "ET POLICY DNS Query")
+
+            assert await search(conn, "nmap") == ["1"]
+        assert threat_db.search_index_available()
+
+    async def test_missing_index_is_created_and_backfilled(self, engine):
+        """A database stamped past the search migration should get the index at startup."""
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await insert_event(conn, "1", "ET SCAN Nmap Scripting Engine")
+
+            # Simulate a schema that never ran the search migration
+            for suffix in ("ai", "ad", "au"):
+                await conn.execute(text(f"DROP TRIGGER threats_events_search_{suffix}"))
+            await conn.execute(text("DROP TABLE threats_events_search"))
+            await insert_event(conn, "2", "ET SCAN Nmap OS Detection")
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+            assert await search(conn, "nmap") == ["1", "2"]
+
+
+@pytest.fixture
+async def client(test_db):
+    """Threat Watch app using the test database and an empty response cache."""
+    response_cache.invalidate_all()
+
+    app = create_app()
+    app.dependency_overrides[get_db_session] = lambda: test_db
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    response_cache.invalidate_all()
+
+
+async def seed_events(session) -> list:
+    """
+    Store events where several share a timestamp
+
+    Returns:
+        Expected ids in (timestamp DESC, id DESC) order
+    """
+    base = datetime(2026, 10, 15, 12, 0, tzinfo=timezone.utc)
+    offsets = [0, 5, 5, 5, 10, 10, 20]  # minutes before base
+    events = [
+        ThreatEvent(unifi_event_id=str(i), timestamp=base.replace(minute=59 - minutes))
+        for i, minutes in enumerate(offsets)
+    ]
+    session.add_all(events)
+    await session.commit()
+
+    ordered = sorted(events, key=lambda event: (event.timestamp, event.id), reverse=True)
+    return [event.id for event in ordered]
+
+
+async def walk_pages(client, url: str, page_size: int = 2, **filters) -> list:
+    """Follow next_cursor until the last page, returning all event ids seen."""
+    ids = []
+    cursor = None
+    while True:
+        params = {"page_size": page_size, **filters}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(url, params=params)
+        assert response.status_code == 200
+        body = response.json()
+        ids += [event["id"] for event in body["events"]]
+
+        cursor = body["next_cursor"]
+        assert body["has_more"] == (cursor is not None)
+        if cursor is None:
+            assert "link" not in response.headers
+            return ids
+        assert response.headers["link"].startswith(f"<{url}?")
+
+
+class TestCursorPagination:
+    """Tests for keyset pagination of the event lists."""
+
+    def test_cursor_round_trip(self):
+        """Should decode to the timestamp and id that were encoded."""
+        timestamp = datetime(2026, 10, 15, 12, 0, 0, 123456, tzinfo=timezone.utc)
+
+        assert _decode_cursor(_encode_cursor(timestamp, 42)) == (timestamp, 42)
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "bm8tc2VwYXJhdG9y", "eHx5"])
+    def test_invalid_cursor_is_rejected(self, cursor):
+        """Should raise a 400 for cursors it didn't produce."""
+        with pytest.raises(HTTPException) as exc_info:
+            _decode_cursor(cursor)
+        assert exc_info.value.status_code == 400
+
+    async def test_invalid_cursor_returns_400(self, client):
+        """The list endpoint should reject a malformed cursor."""
+        response = await client.get("/api/events", params={"cursor": "garbage"})
+        assert response.status_code == 400
+
+    async def test_walk_visits_every_event_once(self, test_db, client):
+        """Pages should neither skip nor repeat events sharing a timestamp."""
+        expected = await seed_events(test_db)
+
+        assert await walk_pages(client, "/api/events") == expected
+
+    async def test_walk_by_ip_merges_source_and_destination(self, test_db, client):
+        """Events for an IP as source, destination or both should each appear once."""
+        expected = await seed_events(test_db)
+        events = (await test_db.execute(select(ThreatEvent))).scalars().all()
+        for i, event in enumerate(events):
+            # Source, destination, both, then unrelated, in rotation
+            event.src_ip = ATTACKER if i % 4 in (0, 2) else "198.51.100.1"
+            event.dest_ip = ATTACKER if i % 4 in (1, 2) else "192.168.1.10"
+        await test_db.commit()
+        related = {event.id for event in events if ATTACKER in (event.src_ip, event.dest_ip)}
+
+        ids = await walk_pages(client, f"/api/events/ip/{ATTACKER}")
+
+        assert ids == [event_id for event_id in expected if event_id in related]
+
+
+def utc_z(timestamp: datetime) -> str:
+    """Format an aware UTC datetime the way the API serializes it."""
+    return timestamp.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class TestIgnoreRuleInvalidation:
+    """Tests for dropping cached responses when ignore rules change."""
+
+    async def test_rule_changes_show_in_stats_immediately(self, test_db, client):
+        """Creating, updating and deleting a rule should not leave stale stats cached."""
+        now = datetime.now(timezone.utc)
+        test_db.add_all([
+            ThreatEvent(unifi_event_id="1", timestamp=now, src_ip=ATTACKER, severity=2),
+            ThreatEvent(unifi_event_id="2", timestamp=now, src_ip=ATTACKER, severity=3),
+            ThreatEvent(unifi_event_id="3", timestamp=now, src_ip="198.51.100.1", severity=1),
+        ])
+        await test_db.commit()
+
+        stats = (await client.get("/api/events/stats")).json()
+        assert (stats["total_events"], stats["ignored_count"]) == (3, 0)
+
+        rule = (await client.post("/api/ignore-rules", json={"ip_address": ATTACKER})).json()
+        stats = (await client.get("/api/events/stats")).json()
+        assert (stats["total_events"], stats["ignored_count"]) == (1, 2)
+
+        await client.put(f"/api/ignore-rules/{rule['id']}", json={"ignore_low": False})
+        stats = (await client.get("/api/events/stats")).json()
+        assert (stats["total_events"], stats["ignored_count"]) == (2, 1)
+
+        await client.delete(f"/api/ignore-rules/{rule['id']}")
+        stats = (await client.get("/api/events/stats")).json()
+        assert (stats["total_events"], stats["ignored_count"]) == (3, 0)
+
+
+class TestResponseCaching:
+    """Tests for ETag revalidation and the per-key response cache."""
+
+    @pytest.fixture(autouse=True)
+    def fixed_etag_window(self, monkeypatch):
+        """Keep the ETag from rolling over to a new time window mid-test."""
+        monkeypatch.setattr(response_cache, "ETAG_WINDOW_SECONDS", 10**9)
+
+    async def test_matching_etag_returns_empty_304(self, client):
+        """A repeat request with the current ETag should get a 304 and no body."""
+        first = await client.get("/api/events/stats")
+        etag = first.headers["etag"]
+
+        response = await client.get("/api/events/stats", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    async def test_invalidation_changes_etag_and_data(self, test_db, client):
+        """After an invalidation the old ETag should get fresh data with a new ETag."""
+        first = await client.get("/api/events/stats")
+        etag = first.headers["etag"]
+        assert first.json()["total_events"] == 0
+
+        test_db.add(ThreatEvent(unifi_event_id="1", timestamp=datetime.now(timezone.utc)))
+        await test_db.commit()
+        response_cache.invalidate_all()
+
+        response = await client.get("/api/events/stats", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["total_events"] == 1
+
+    async def test_query_variants_are_cached_separately(self, test_db, client):
+        """Responses for different query parameters should not be served for each other."""
+        now = datetime.now(timezone.utc)
+        test_db.add(ThreatEvent(unifi_event_id="1", timestamp=now, ignored=True))
+        await test_db.commit()
+
+        visible = (await client.get("/api/events/stats")).json()
+        everything = (await client.get("/api/events/stats?include_ignored=true")).json()
+        assert visible["total_events"] == 0
+        assert everything["total_events"] == 1
+
+        hourly = (await client.get("/api/events/timeline?interval=hour")).json()
+        daily = (await client.get("/api/events/timeline?interval=day")).json()
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        assert hourly["data"] == [
+            {"timestamp": hour.strftime("%Y-%m-%dT%H:%M:%SZ"), "count": 1}
+        ]
+        assert daily["data"] == [{"timestamp": now.strftime("%Y-%m-%dT00:00:00Z"), "count": 1}]
+
+        # Without an invalidation each variant keeps serving its own cached copy
+        test_db.add(ThreatEvent(unifi_event_id="2", timestamp=now))
+        await test_db.commit()
+        assert (await client.get("/api/events/stats")).json() == visible
+        assert (await client.get("/api/events/stats?include_ignored=true")).json() == everything
+
+
+class TestStats:
+    """Tests for the /api/events/stats overview."""
+
+    async def test_stats_against_seeded_events(self, test_db, client):
+        """Every total and breakdown should count only the matching events."""
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        other = "198.51.100.1"
+        rows = [
+            # (hours ago, severity, category, action, source, country, ignored)
+            (1, 1, "scan", "block", ATTACKER, "DE", False),
+            (2, 2, "scan", "alert", ATTACKER, "DE", False),
+            (72, 3, "policy", "alert", other, "US", False),
+            (120, 3, "policy", "alert", ATTACKER, "DE", False),
+            (240, 2, "scan", "block", other, None, False),
+            (1, 1, "malware", "block", ATTACKER, "DE", True),
+        ]
+        test_db.add_all([
+            ThreatEvent(
+                unifi_event_id=str(i), timestamp=now - timedelta(hours=hours),
+                severity=severity, category=category, action=action, src_ip=src_ip,
+                src_country=country, src_org="Example AS" if src_ip == ATTACKER else None,
+                ignored=ignored,
+            )
+            for i, (hours, severity, category, action, src_ip, country, ignored)
+            in enumerate(rows)
+        ])
+        await test_db.commit()
+
+        stats = (await client.get("/api/events/stats")).json()
+
+        assert stats["total_events"] == 5
+        assert stats["events_24h"] == 2
+        assert stats["events_7d"] == 4
+        assert stats["blocked_count"] == 2
+        assert stats["alert_count"] == 3
+        assert stats["ignored_count"] == 1
+        assert stats["by_severity"] == [
+            {"severity": 1, "label": "High", "count": 1},
+            {"severity": 2, "label": "Medium", "count": 2},
+            {"severity": 3, "label": "Low", "count": 2},
+        ]
+        assert stats["by_category"] == [
+            {"category": "scan", "count": 3},
+            {"category": "policy", "count": 2},
+        ]
+        assert stats["by_country"] == [
+            {"country": "DE", "country_code": "DE", "count": 3},
+            {"country": "US", "country_code": "US", "count": 1},
+        ]
+        assert stats["top_attackers"] == [
+            {"ip": ATTACKER, "count": 3, "country": "DE", "org": "Example AS",
+             "last_seen": utc_z(now - timedelta(hours=1))},
+            {"ip": other, "count": 2, "country": "US", "org": None,
+             "last_seen": utc_z(now - timedelta(hours=72))},
+        ]
+
+        everything = (await client.get("/api/events/stats?include_ignored=true")).json()
+
+        assert everything["total_events"] == 6
+        assert everything["events_24h"] == 3
+        assert everything["blocked_count"] == 3
+        assert everything["ignored_count"] == 1
+        assert everything["by_severity"][0] == {"severity": 1, "label": "High", "count": 2}
+        assert everything["by_category"][-1] == {"category": "malware", "count": 1}
+        assert everything["top_attackers"][0]["count"] == 4
+
+
+class TestTimeline:
+    """Tests for the /api/events/timeline buckets."""
+
+    async def test_hourly_buckets_across_hour_boundary(self, test_db, client):
+        """Events should be counted per UTC hour, oldest bucket first."""
+        hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        hour -= timedelta(hours=3)
+        offsets = [
+            timedelta(hours=2, minutes=15),
+            timedelta(minutes=59, seconds=59),
+            timedelta(hours=1),
+            timedelta(hours=1, minutes=30),
+            timedelta(days=-2),  # outside the one day window
+        ]
+        test_db.add_all([
+            ThreatEvent(unifi_event_id=str(i), timestamp=hour + offset)
+            for i, offset in enumerate(offsets)
+        ])
+        await test_db.commit()
+
+        timeline = (await client.get("/api/events/timeline?interval=hour&days=1")).json()
+
+        assert timeline["interval"] == "hour"
+        assert timeline["data"] == [
+            {"timestamp": utc_z(hour), "count": 1},
+            {"timestamp": utc_z(hour + timedelta(hours=1)), "count": 2},
+            {"timestamp": utc_z(hour + timedelta(hours=2)), "count": 1},
+        ]
+        for point in timeline["data"]:
+            bucket = datetime.fromisoformat(point["timestamp"])
+            assert bucket.tzinfo is not None and bucket.utcoffset() == timedelta(0)
+
+
+class TestStream:
+    """Tests for the /api/events/stream NDJSON export."""
+
+    async def test_stream_newest_first_up_to_limit(self, test_db, client):
+        """Should write one event object per line, newest first, stopping at limit."""
+        expected = await seed_events(test_db)
+
+        response = await client.get("/api/events/stream", params={"limit": 4})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.text.endswith("\n")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [event["id"] for event in events] == expected[:4]
+        assert all(event["timestamp"].endswith("Z") for event in events)
+
+
+class TestSearch:
+    """Tests for ?search= on the event list."""
+
+    SIGNATURES = [
+        "ET SCAN Nmap Scripting Engine",
+        'ET WEB_SERVER "cmd.exe" in URI',
+        "ET TROJAN Win32-Agent Checkin",
+        "ET EXPLOIT Possible a*b Overflow",
+        "ET POLICY DNS Query",
+    ]
+
+    @pytest.fixture
+    async def seeded(self, test_db):
+        """Store one event per signature, returning their ids by signature."""
+        now = datetime.now(timezone.utc)
+        events = [
+            ThreatEvent(unifi_event_id=str(i), timestamp=now, signature=signature)
+            for i, signature in enumerate(self.SIGNATURES)
+        ]
+        test_db.add_all(events)
+        await test_db.commit()
+        return {event.signature: event.id for event in events}
+
+    async def list_ids(self, client, search: str) -> list:
+        """Return the ids of the first page of search results."""
+        response = await client.get("/api/events", params={"search": search})
+        assert response.status_code == 200
+        return [event["id"] for event in response.json()["events"]]
+
+    async def test_short_search_falls_back_to_ilike(self, client, seeded):
+        """Searches shorter than a trigram should still match case-insensitively."""
+        assert await self.list_ids(client, "nm") == [seeded["ET SCAN Nmap Scripting Engine"]]
+
+    @pytest.mark.parametrize("search, signature", [
+        ('"cmd.exe"', 'ET WEB_SERVER "cmd.exe" in URI'),
+        ("win32-agent", "ET TROJAN Win32-Agent Checkin"),
+        ("a*b", "ET EXPLOIT Possible a*b Overflow"),
+    ])
+    async def test_query_syntax_is_matched_literally(self, client, seeded, search, signature):
+        """Quotes, stars and dashes should be searched for, not parsed as FTS syntax."""
+        assert threat_db.search_index_available()
+
+        assert await self.list_ids(client, search) == [seeded[signature]]
+
+    async def test_search_with_filters_and_cursor(self, test_db, client):
+        """Search should combine with the other filters across cursor pages."""
+        expected = await seed_events(test_db)
+        events = (await test_db.execute(select(ThreatEvent))).scalars().all()
+        for i, event in enumerate(events):
+            event.signature = "ET SCAN Nmap" if i % 3 else "ET POLICY DNS Query"
+            event.severity = 2 if i == 4 else 1
+        await test_db.commit()
+        matching = {
+            event.id for event in events
+            if event.signature == "ET SCAN Nmap" and event.severity == 1
+        }
+
+        ids = await walk_pages(client, "/api/events", search="nmap", severity=1)
+
+        assert len(matching) > 2
+        assert ids == [event_id for event_id in expected if event_id in matching]
+
+
+class TestDatetimeSerialization:
+    """Tests for datetimes in API responses being marked as UTC."""
+
+    async def test_event_detail_datetimes_end_in_z(self, test_db, client):
+        """Stored events should come back with UTC timestamps in the detail view."""
+        event = ThreatEvent(unifi_event_id="1", timestamp=datetime.now(timezone.utc))
+        test_db.add(event)
+        await test_db.commit()
+
+        detail = (await client.get(f"/api/events/{event.id}")).json()
+
+        assert detail["timestamp"].endswith("Z")
+        assert detail["fetched_at"].endswith("Z")
+
+    async def test_ignore_rule_created_at_ends_in_z(self, client):
+        """created_at set by the database default should come back as UTC."""
+        created = (await client.post("/api/ignore-rules", json={"ip_address": ATTACKER})).json()
+
+        rule = (await client.get(f"/api/ignore-rules/{created['id']}")).json()
+
+        assert rule["created_at"].endswith("Z")
@@ -0,0 +1,74 @@
+"""Tests for the cached UniFi connection settings."""
+import pytest
+
+from shared import unifi_session
+from shared.crypto import encrypt_password
+from shared.models.unifi_config import UniFiConfig
+
+
+async def save_config(session, controller_url: str):
+    """Insert or update the single UniFi config row."""
+    config = await session.get(UniFiConfig, 1)
+    if config is None:
+        config = UniFiConfig(id=1, site_id="default", verify_ssl=False)
+        session.add(config)
+    config.controller_url = controller_url
+    config.username = "admin"
+    config.password_encrypted = encrypt_password("secret")
+    await session.commit()
+
+
+class TestClientSettings:
+    """Tests for get_client_settings caching and invalidation."""
+
+    @pytest.fixture(autouse=True)
+    def reset_cache(self):
+        """Start and end every test with an empty settings cache."""
+        unifi_session.invalidate_client_settings()
+        yield
+        unifi_session.invalidate_client_settings()
+
+    async def test_missing_config_returns_none(self, test_db):
+        """Should return None and cache nothing when no config is saved."""
+        assert await unifi_session.get_client_settings(test_db) is None
+        assert unifi_session._client_settings is None
+
+    async def test_settings_are_decrypted_and_cached(self, test_db):
+        """Should decrypt once and serve later lookups from memory."""
+        await save_config(test_db, "https://10.0.0.1")
+
+        settings = await unifi_session.get_client_settings(test_db)
+        assert settings["host"] == "https://10.0.0.1"
+        assert settings["password"] == "secret"
+
+        # A change without invalidation is not picked up
+        await save_config(test_db, "https://10.0.0.2")
+        assert await unifi_session.get_client_settings(test_db) is settings
+
+    async def test_invalidate_reloads_settings(self, test_db):
+        """Should re-read the config after invalidation."""
+        await save_config(test_db, "https://10.0.0.1")
+        await unifi_session.get_client_settings(test_db)
+
+        await save_config(test_db, "https://10.0.0.2")
+        unifi_session.invalidate_client_settings()
+
+        settings = await unifi_session.get_client_settings(test_db)
+        assert settings["host"] == "https://10.0.0.2"
+
+    async def test_lookup_racing_a_save_is_not_cached(self, test_db, monkeypatch):
+        """A result read before a concurrent save must not be cached."""
+        await save_config(test_db, "https://10.0.0.1")
+        decrypt = unifi_session.decrypt_client_settings
+
+        def decrypt_during_save(unifi_config):
+            # The config is saved and invalidated while this lookup decrypts
+            unifi_session.invalidate_client_settings()
+            return decrypt(unifi_config)
+
+        monkeypatch.setattr(unifi_session, "decrypt_client_settings", decrypt_during_save)
+
+        settings = await unifi_session.get_client_settings(test_db)
+
+        assert settings["host"] == "https://10.0.0.1"
+        assert unifi_session._client_settings is None
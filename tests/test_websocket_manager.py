@@ -0,0 +1,164 @@
+"""Tests for WebSocket connection manager."""
+import asyncio
+import json
+
+from shared import websocket_manager
+from shared.websocket_manager import WebSocketManager, CLIENT_QUEUE_SIZE
+
+
+class FakeWebSocket:
+    """Minimal stand-in for a Starlette WebSocket."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.accepted = False
+        self.sent = []
+        self.close_code = None
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_bytes(self, data):
+        if self.fail:
+            raise RuntimeError("connection closed")
+        self.sent.append(json.loads(data))
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+async def drain():
+    """Give writer tasks a chance to flush their queues."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestConnectionTracking:
+    """Tests for connect/disconnect bookkeeping."""
+
+    async def test_connect_accepts_and_registers(self):
+        """Should accept the socket and track it."""
+        manager = WebSocketManager()
+        ws = FakeWebSocket()
+
+        await manager.connect(ws)
+
+        assert ws.accepted
+        assert ws in manager.active_connections
+
+    async def test_disconnect_removes_connection(self):
+        """Should stop tracking a disconnected socket and cancel its writer."""
+        manager = WebSocketManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        task = manager.active_connections[ws].task
+
+        manager.disconnect(ws)
+        await drain()
+
+        assert ws not in manager.active_connections
+        assert task.cancelled()
+
+    def test_disconnect_unknown_connection_is_noop(self):
+        """Disconnecting an untracked socket should not raise."""
+        manager = WebSocketManager()
+        manager.disconnect(FakeWebSocket())
+        assert len(manager.active_connections) == 0
+
+
+class TestBroadcast:
+    """Tests for broadcasting to connected clients."""
+
+    async def test_broadcast_reaches_all_clients(self):
+        """Every connected client should receive the message."""
+        manager = WebSocketManager()
+        clients = [FakeWebSocket() for _ in range(3)]
+        for ws in clients:
+            await manager.connect(ws)
+
+        await manager.broadcast({"type": "threat_update", "new_events": 2})
+        await drain()
+
+        for ws in clients:
+            assert ws.sent == [{"type": "threat_update", "new_events": 2}]
+
+    async def test_broadcast_drops_failed_clients(self):
+        """Clients that error on send should be removed."""
+        manager = WebSocketManager()
+        good = FakeWebSocket()
+        bad = FakeWebSocket(fail=True)
+        await manager.connect(good)
+        await manager.connect(bad)
+
+        await manager.broadcast_device_update({"mac": "aa:bb:cc:dd:ee:ff"})
+        await drain()
+
+        assert good in manager.active_connections
+        assert bad not in manager.active_connections
+        assert bad.close_code == websocket_manager.WS_CLOSE_CODE_DROPPED
+        assert good.close_code is None
+        assert good.sent == [{"type": "device_update", "device": {"mac": "aa:bb:cc:dd:ee:ff"}}]
+
+    async def test_broadcast_with_no_clients_is_noop(self):
+        """Broadcasting with no connections should not raise."""
+        manager = WebSocketManager()
+        await manager.broadcast_status_update({"ok": True})
+
+    async def test_broadcast_encodes_payload_once(self):
+        """All clients should receive the identical encoded binary frame."""
+        manager = WebSocketManager()
+        frames = []
+
+        class RecordingWebSocket(FakeWebSocket):
+            async def send_bytes(self, data):
+                frames.append(data)
+
+        for _ in range(3):
+            await manager.connect(RecordingWebSocket())
+
+        await manager.broadcast({"type": "stats_update", "data": {"clients": 5}})
+        await drain()
+
+        assert len(frames) == 3
+        assert all(frame is frames[0] for frame in frames)
+
+    async def test_slow_client_is_dropped_when_queue_full(self):
+        """A client that can't keep up should be dropped without affecting others."""
+        manager = WebSocketManager()
+        stalled = asyncio.Event()
+
+        class StalledWebSocket(FakeWebSocket):
+            async def send_bytes(self, data):
+                await stalled.wait()
+
+        slow = StalledWebSocket()
+        fast = FakeWebSocket()
+        await manager.connect(slow)
+        await manager.connect(fast)
+
+        for i in range(CLIENT_QUEUE_SIZE + 2):
+            await manager.broadcast({"seq": i})
+            await drain()
+
+        assert slow not in manager.active_connections
+        assert slow.close_code == websocket_manager.WS_CLOSE_CODE_DROPPED
+        assert fast in manager.active_connections
+        assert len(fast.sent) == CLIENT_QUEUE_SIZE + 2
+
+    async def test_stuck_send_times_out_and_drops_client(self, monkeypatch):
+        """A send that blocks past the timeout should count as a disconnect."""
+        monkeypatch.setattr(websocket_manager, "WS_SEND_TIMEOUT", 0.01)
+        manager = WebSocketManager()
+
+        class StuckWebSocket(FakeWebSocket):
+            async def send_bytes(self, data):
+                await asyncio.Event().wait()
+
+        stuck = StuckWebSocket()
+        await manager.connect(stuck)
+
+        await manager.broadcast({"type": "ping"})
+        await asyncio.sleep(0.05)
+
+        assert stuck not in manager.active_connections
+        assert stuck.close_code == websocket_manager.WS_CLOSE_CODE_DROPPED
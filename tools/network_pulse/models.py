@@ -5,14 +5,15 @@ from pydantic import BaseModel, Field, field_serializer
 from typing import Optional, List, Dict
 from datetime import datetime, timezone
 
+_UTC = timezone.utc
+
 
 def serialize_datetime(dt: Optional[datetime]) -> Optional[str]:
     """Convert datetime to ISO format with Z suffix"""
     if dt is None:
         return None
     if dt.tzinfo is not None:
-        dt_utc = dt.astimezone(timezone.utc)
-        return dt_utc.isoformat().replace('+00:00', 'Z')
+        dt = dt.astimezone(_UTC).replace(tzinfo=None)
     return dt.isoformat() + 'Z'
 
 
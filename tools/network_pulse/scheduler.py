@@ -286,12 +286,13 @@ async def refresh_network_stats():
             f"{devices.clients} clients, {devices.aps} APs"
         )
 
-        # Broadcast update via WebSocket
+        # Broadcast update via WebSocket (skip the dump when nobody is listening)
         ws_manager = get_ws_manager()
-        await ws_manager.broadcast({
-            "type": "stats_update",
-            "data": _cached_data.model_dump()
-        })
+        if ws_manager.has_connections:
+            await ws_manager.broadcast({
+                "type": "stats_update",
+                "data": _cached_data.model_dump()
+            })
 
     except Exception as e:
         logger.error(f"Error in network stats refresh: {e}", exc_info=True)
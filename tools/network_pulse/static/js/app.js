@@ -127,6 +127,8 @@ function networkPulse() {
 
             try {
                 this.ws = new WebSocket(wsUrl);
+                // Broadcasts arrive as binary frames containing UTF-8 JSON
+                this.ws.binaryType = 'arraybuffer';
 
                 this.ws.onopen = () => {
                     console.log('WebSocket connected');
@@ -148,7 +150,7 @@ function networkPulse() {
 
                 this.ws.onmessage = (event) => {
                     try {
-                        const message = JSON.parse(event.data);
+                        const message = JSON.parse(typeof event.data === 'string' ? event.data : new TextDecoder().decode(event.data));
 
                         if (message.type === 'stats_update' && message.data) {
                             console.log('Received stats update via WebSocket');
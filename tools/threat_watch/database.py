@@ -1,10 +1,37 @@
 """
 Database models for Threat Watch
 """
+import logging
 from datetime import datetime, timezone
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, Float, Text, Index
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Float, Text, Index, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql import column, table
+from sqlalchemy.types import TypeDecorator
 from shared.models.base import Base
 
+logger = logging.getLogger(__name__)
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    DateTime stored as naive UTC and loaded back as timezone-aware UTC.
+
+    SQLite drops tzinfo, so values are normalized on the way in and out. API
+    models can then emit ISO timestamps with a 'Z' suffix natively.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
 
 class ThreatEvent(Base):
     """
@@ -19,21 +46,21 @@ class ThreatEvent(Base):
     flow_id = Column(String, nullable=True)
 
     # Timestamp
-    timestamp = Column(DateTime, nullable=False, index=True)
+    timestamp = Column(UTCDateTime, nullable=False, index=True)
 
     # Alert information
     signature = Column(String, nullable=True)  # inner_alert_signature
     signature_id = Column(Integer, nullable=True)  # inner_alert_signature_id
-    severity = Column(Integer, nullable=True, index=True)  # inner_alert_severity
-    category = Column(String, nullable=True, index=True)  # inner_alert_category / catname
+    severity = Column(Integer, nullable=True)  # inner_alert_severity
+    category = Column(String, nullable=True)  # inner_alert_category / catname
     action = Column(String, nullable=True)  # inner_alert_action (alert, block)
     message = Column(Text, nullable=True)  # msg
 
     # Network information
-    src_ip = Column(String, nullable=True, index=True)
+    src_ip = Column(String, nullable=True)
     src_port = Column(Integer, nullable=True)
     src_mac = Column(String, nullable=True)
-    dest_ip = Column(String, nullable=True, index=True)
+    dest_ip = Column(String, nullable=True)
     dest_port = Column(Integer, nullable=True)
     dest_mac = Column(String, nullable=True)
     protocol = Column(String, nullable=True)  # proto
@@ -62,22 +89,126 @@ class ThreatEvent(Base):
     raw_data = Column(Text, nullable=True)  # Store full JSON for reference
 
     # Ignore list tracking
-    ignored = Column(Boolean, default=False, nullable=False, index=True)
+    ignored = Column(Boolean, default=False, nullable=False)
     ignored_by_rule_id = Column(Integer, nullable=True)
 
     # When we fetched this event
-    fetched_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    fetched_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
 
     # Indexes for common queries
     __table_args__ = (
         Index('ix_threats_events_timestamp_severity', 'timestamp', 'severity'),
         Index('ix_threats_events_src_ip_timestamp', 'src_ip', 'timestamp'),
+        Index('ix_threats_events_dest_ip_timestamp', 'dest_ip', 'timestamp'),
+        # Nearly every query filters on ignored and a timestamp window/order
+        Index('ix_threats_events_ignored_timestamp', 'ignored', 'timestamp'),
+        # Dashboard filter shapes: equality on ignored plus one column, ordered
+        # by timestamp. These also cover the single-column lookups they replace
+        Index('ix_threats_events_ignored_severity_timestamp', 'ignored', 'severity', 'timestamp'),
+        Index('ix_threats_events_ignored_category_timestamp', 'ignored', 'category', 'timestamp'),
+        Index('ix_threats_events_ignored_action_timestamp', 'ignored', 'action', 'timestamp'),
+        Index('ix_threats_events_ignored_src_ip_timestamp', 'ignored', 'src_ip', 'timestamp'),
+        Index('ix_threats_events_ignored_dest_ip_timestamp', 'ignored', 'dest_ip', 'timestamp'),
     )
 
     def __repr__(self):
         return f"<ThreatEvent(id={self.id}, signature={self.signature}, src_ip={self.src_ip}, severity={self.severity})>"
 
 
+# Trigram full-text index over signature/message for substring search.
+# LIKE '%term%' can't use a B-tree index; a MATCH against the FTS5 trigram
+# index can. Kept in sync with threats_events by triggers.
+THREAT_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS threats_events_search USING fts5("
+    "signature, message, content='threats_events', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS threats_events_search_ai "
+    "AFTER INSERT ON threats_events BEGIN "
+    "INSERT INTO threats_events_search(rowid, signature, message) "
+    "VALUES (new.id, new.signature, new.message); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS threats_events_search_ad "
+    "AFTER DELETE ON threats_events BEGIN "
+    "INSERT INTO threats_events_search(threats_events_search, rowid, signature, message) "
+    "VALUES ('delete', old.id, old.signature, old.message); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS threats_events_search_au "
+    "AFTER UPDATE OF signature, message ON threats_events BEGIN "
+    "INSERT INTO threats_events_search(threats_events_search, rowid, signature, message) "
+    "VALUES ('delete', old.id, old.signature, old.message); "
+    "INSERT INTO threats_events_search(rowid, signature, message) "
+    "VALUES (new.id, new.signature, new.message); "
+    "END",
+]
+
+# Query handle for the search index (created by the DDL above, not by metadata)
+threats_events_search = table("threats_events_search", column("rowid"))
+
+# Set once the search index is known to exist in this process
+_search_index_available = False
+
+
+def search_index_available() -> bool:
+    """Whether substring search can use the trigram index"""
+    return _search_index_available
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _ensure_search_index(target, connection, **kw):
+    """
+    Create the search index and its triggers if they are missing
+
+    Runs after every create_all (i.e. at each startup), so databases whose
+    migration history was stamped without running the migration get the
+    index too. A newly created index is filled from the existing events.
+    The trigram tokenizer needs SQLite 3.34 or newer; without it search
+    falls back to LIKE.
+    """
+    global _search_index_available
+
+    if connection.dialect.name != "sqlite":
+        return
+
+    tables = set(connection.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'table' "
+        "AND name IN ('threats_events', 'threats_events_search')"
+    ).scalars())
+    if "threats_events" not in tables:
+        return
+    existed = "threats_events_search" in tables
+
+    try:
+        for statement in THREAT_SEARCH_DDL:
+            connection.exec_driver_sql(statement)
+    except OperationalError as e:
+        logger.warning(
+            f"Threat event search index unavailable ({e.orig}); trigram search "
+            f"requires SQLite 3.34 or newer, falling back to slower LIKE search"
+        )
+        return
+
+    if not existed:
+        logger.info("Building threat event search index...")
+        connection.exec_driver_sql(
+            "INSERT INTO threats_events_search(threats_events_search) VALUES ('rebuild')"
+        )
+
+    _search_index_available = True
+
+
+class ThreatHourlyCount(Base):
+    """
+    Number of threat events stored per hour, maintained at ingest time.
+    Lets the status endpoint report event totals without scanning threats_events.
+    """
+    __tablename__ = "threats_hourly_counts"
+
+    hour_bucket = Column(DateTime, primary_key=True)  # Event timestamp truncated to the hour (UTC)
+    count = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<ThreatHourlyCount(hour={self.hour_bucket}, count={self.count})>"
+
+
 class ThreatWebhookConfig(Base):
     """
     Stores webhook configurations for sending threat event notifications
@@ -97,8 +228,8 @@ class ThreatWebhookConfig(Base):
     event_block = Column(Boolean, default=True, nullable=False)  # IPS blocks
 
     enabled = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    last_triggered = Column(DateTime, nullable=True)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    last_triggered = Column(UTCDateTime, nullable=True)
 
     def __repr__(self):
         return f"<ThreatWebhookConfig(name={self.name}, type={self.webhook_type}, enabled={self.enabled})>"
@@ -125,11 +256,11 @@ class ThreatIgnoreRule(Base):
     match_destination = Column(Boolean, default=False, nullable=False)  # Match when IP is dest_ip
 
     enabled = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
 
     # Stats
     events_ignored = Column(Integer, default=0, nullable=False)
-    last_matched = Column(DateTime, nullable=True)
+    last_matched = Column(UTCDateTime, nullable=True)
 
     def __repr__(self):
         return f"<ThreatIgnoreRule(ip={self.ip_address}, enabled={self.enabled})>"
@@ -5,15 +5,16 @@ from fastapi import FastAPI, Request, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from datetime import datetime, timezone, timedelta
 
-from tools.threat_watch import __version__
+from tools.threat_watch import __version__, response_cache
 from tools.threat_watch.routers import events, config, webhooks, ignore_rules
-from tools.threat_watch.database import ThreatEvent
+from tools.threat_watch.database import ThreatEvent, ThreatHourlyCount
 from tools.threat_watch.models import SystemStatus
-from tools.threat_watch.scheduler import get_last_refresh, DEFAULT_REFRESH_INTERVAL
+from tools.threat_watch.scheduler import get_last_refresh, hour_bucket, DEFAULT_REFRESH_INTERVAL
 from shared.database import get_db_session
 from shared.models.unifi_config import UniFiConfig
 from shared.unifi_client import UniFiClient
@@ -29,6 +30,9 @@ BASE_DIR = Path(__file__).parent
 # Set up templates
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 
+# Serializes status recomputation so concurrent polls share one query
+_status_lock = asyncio.Lock()
+
 
 def create_app() -> FastAPI:
     """
@@ -187,25 +191,48 @@ def create_app() -> FastAPI:
     ):
         """
         Get system status including last refresh time and event counts
-        """
-        now = datetime.now(timezone.utc)
-        day_ago = now - timedelta(days=1)
 
-        # Get total event count
-        total_result = await db.execute(select(func.count(ThreatEvent.id)))
-        total_events = total_result.scalar() or 0
-
-        # Get events in last 24 hours
-        result_24h = await db.execute(
-            select(func.count(ThreatEvent.id)).where(ThreatEvent.timestamp >= day_ago)
-        )
-        events_24h = result_24h.scalar() or 0
-
-        return SystemStatus(
-            last_refresh=get_last_refresh(),
-            total_events=total_events,
-            events_24h=events_24h,
-            refresh_interval_seconds=DEFAULT_REFRESH_INTERVAL
-        )
+        The result is cached briefly since every open dashboard polls it.
+        """
+        status = response_cache.get_cached("status")
+        if status is not None:
+            return status
+
+        async with _status_lock:
+            # Another request may have refreshed the cache while we waited
+            status = response_cache.get_cached("status")
+            if status is not None:
+                return status
+
+            now = datetime.now(timezone.utc)
+            day_ago = now - timedelta(days=1)
+            # First full hour inside the 24h window; events before it are
+            # counted directly so the window stays exact
+            next_hour = hour_bucket(day_ago) + timedelta(hours=1)
+
+            # Read the per-hour counters instead of scanning threats_events,
+            # all in a single round-trip
+            counts_result = await db.execute(
+                select(
+                    select(func.coalesce(func.sum(ThreatHourlyCount.count), 0))
+                    .scalar_subquery().label("total"),
+                    select(func.coalesce(func.sum(ThreatHourlyCount.count), 0))
+                    .where(ThreatHourlyCount.hour_bucket >= next_hour)
+                    .scalar_subquery().label("full_hours"),
+                    select(func.count()).select_from(ThreatEvent)
+                    .where(ThreatEvent.timestamp >= day_ago, ThreatEvent.timestamp < next_hour)
+                    .scalar_subquery().label("partial_hour")
+                )
+            )
+            counts = counts_result.one()
+
+            status = SystemStatus(
+                last_refresh=get_last_refresh(),
+                total_events=counts.total,
+                events_24h=counts.full_hours + counts.partial_hour,
+                refresh_interval_seconds=DEFAULT_REFRESH_INTERVAL
+            )
+            response_cache.set_cached("status", status, response_cache.STATUS_CACHE_TTL_SECONDS)
+            return status
 
     return app
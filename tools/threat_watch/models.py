@@ -1,19 +1,12 @@
 """
 Pydantic models for Threat Watch API requests and responses
+
+Datetimes loaded from the database are timezone-aware UTC (see UTCDateTime
+in database.py), so they serialize as ISO strings with a 'Z' suffix.
 """
-from pydantic import BaseModel, Field, field_serializer
+from pydantic import BaseModel, Field
 from typing import Optional, List
-from datetime import datetime, timezone
-
-
-def serialize_datetime(dt: Optional[datetime]) -> Optional[str]:
-    """Serialize datetime to ISO format string with UTC timezone indicator"""
-    if dt is None:
-        return None
-    if dt.tzinfo is not None:
-        dt_utc = dt.astimezone(timezone.utc)
-        return dt_utc.isoformat().replace('+00:00', 'Z')
-    return dt.isoformat() + 'Z'
+from datetime import datetime
 
 
 # Threat Event Models
@@ -48,10 +41,6 @@ class ThreatEventResponse(BaseModel):
     dest_city: Optional[str]
     dest_org: Optional[str]
 
-    @field_serializer('timestamp')
-    def serialize_dt(self, dt: Optional[datetime], _info) -> Optional[str]:
-        return serialize_datetime(dt)
-
     class Config:
         from_attributes = True
 
@@ -103,10 +92,6 @@ class ThreatEventDetail(BaseModel):
     archived: bool
     fetched_at: datetime
 
-    @field_serializer('timestamp', 'fetched_at')
-    def serialize_dt(self, dt: Optional[datetime], _info) -> Optional[str]:
-        return serialize_datetime(dt)
-
     class Config:
         from_attributes = True
 
@@ -114,10 +99,11 @@ class ThreatEventDetail(BaseModel):
 class ThreatEventsListResponse(BaseModel):
     """Response model for list of threat events"""
     events: List[ThreatEventResponse]
-    total: int
+    total: Optional[int] = None  # Only computed with ?include_total=true
     page: int
     page_size: int
     has_more: bool
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page
 
 
 # Statistics Models
@@ -143,10 +129,6 @@ class TopAttacker(BaseModel):
     org: Optional[str]
     last_seen: datetime
 
-    @field_serializer('last_seen')
-    def serialize_dt(self, dt: Optional[datetime], _info) -> Optional[str]:
-        return serialize_datetime(dt)
-
 
 class SeverityCount(BaseModel):
     """Count of events by severity"""
@@ -175,10 +157,6 @@ class TimelinePoint(BaseModel):
     timestamp: datetime
     count: int
 
-    @field_serializer('timestamp')
-    def serialize_dt(self, dt: Optional[datetime], _info) -> Optional[str]:
-        return serialize_datetime(dt)
-
 
 class ThreatTimelineResponse(BaseModel):
     """Response model for threat timeline"""
@@ -186,6 +164,11 @@ class ThreatTimelineResponse(BaseModel):
     data: List[TimelinePoint]
 
 
+class CategoriesResponse(BaseModel):
+    """Response model for list of threat categories"""
+    categories: List[str]
+
+
 # Filter Models
 
 class ThreatEventFilters(BaseModel):
@@ -211,10 +194,6 @@ class SystemStatus(BaseModel):
     events_24h: int
     refresh_interval_seconds: int
 
-    @field_serializer('last_refresh')
-    def serialize_dt(self, dt: Optional[datetime], _info) -> Optional[str]:
-        return serialize_datetime(dt)
-
 
 # Webhook Models
 
@@ -252,10 +231,6 @@ class WebhookResponse(BaseModel):
     created_at: datetime
     last_triggered: Optional[datetime] = None
 
-    @field_serializer('created_at', 'last_triggered')
-    def serialize_dt(self, dt: Optional[datetime], _info) -> Optional[str]:
-        return serialize_datetime(dt)
-
     class Config:
         from_attributes = True
 
@@ -307,10 +282,6 @@ class IgnoreRuleResponse(BaseModel):
     events_ignored: int
     last_matched: Optional[datetime] = None
 
-    @field_serializer('created_at', 'last_matched')
-    def serialize_dt(self, dt: Optional[datetime], _info) -> Optional[str]:
-        return serialize_datetime(dt)
-
     class Config:
         from_attributes = True
 
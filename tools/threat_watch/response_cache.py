@@ -0,0 +1,115 @@
+"""
+Short-lived in-memory cache for Threat Watch API responses.
+
+Dashboard tabs poll the same aggregate endpoints every few seconds. Results
+are cached for a short TTL and the whole cache is invalidated whenever the
+scheduler stores new events, so they show up immediately.
+"""
+import logging
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cache TTL for the /api/status response (seconds)
+STATUS_CACHE_TTL_SECONDS = 5
+
+# Cache TTL for the full /api/events/stats response (seconds)
+STATS_CACHE_TTL_SECONDS = 30
+
+# Cache TTL for the top-10 breakdowns in /api/events/stats (seconds)
+STATS_TOP_CACHE_TTL_SECONDS = 300
+
+# Cache TTL for /api/events/timeline responses (seconds)
+TIMELINE_CACHE_TTL_SECONDS = 30
+
+# Cache TTL for the /api/events/categories list (seconds)
+CATEGORIES_CACHE_TTL_SECONDS = 300
+
+# Cache TTL for filtered event totals in the paginated event lists (seconds)
+EVENTS_TOTAL_CACHE_TTL_SECONDS = 30
+
+# Global cache storage: key -> (expires_at, value)
+_cache: Dict[str, Tuple[float, Any]] = {}
+
+# ETags roll over at least this often (seconds), since results like "last
+# 24 hours" change with the clock even when no new events arrive
+ETAG_WINDOW_SECONDS = 30
+
+# Identifies this process so ETags issued before a restart never match
+_instance_id = uuid.uuid4().hex[:8]
+
+# Incremented on every invalidation
+_generation = 0
+
+
+def get_cached(key: str) -> Optional[Any]:
+    """
+    Get a cached value.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Cached value if present and not expired, None otherwise
+    """
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+
+    expires_at, value = entry
+    if time.monotonic() >= expires_at:
+        _cache.pop(key, None)
+        return None
+
+    logger.debug(f"Returning cached '{key}'")
+    return value
+
+
+def set_cached(key: str, value: Any, ttl_seconds: float):
+    """
+    Cache a value for a limited time.
+
+    Args:
+        key: Cache key
+        value: Value to cache
+        ttl_seconds: How long the value stays valid
+    """
+    _cache[key] = (time.monotonic() + ttl_seconds, value)
+
+
+def etag() -> str:
+    """
+    Get a weak ETag for the current version of Threat Watch data.
+
+    Returns:
+        ETag that changes whenever the cache is invalidated and at least
+        every ETAG_WINDOW_SECONDS
+    """
+    window = int(time.time() // ETAG_WINDOW_SECONDS)
+    return f'W/"{_instance_id}-{_generation}-{window}"'
+
+
+def invalidate(key: str):
+    """
+    Drop a single cached value, leaving the rest of the cache and the ETag
+    generation untouched.
+
+    Args:
+        key: Cache key
+    """
+    _cache.pop(key, None)
+
+
+def invalidate_all():
+    """
+    Invalidate all cached responses.
+    Called by the scheduler when a refresh stores new events and when ignore
+    rules change which events are ignored.
+    """
+    global _generation
+
+    _cache.clear()
+    _generation += 1
+    logger.debug("Threat Watch response cache invalidated")
@@ -2,6 +2,7 @@
 UniFi configuration API endpoints for Threat Watch
 Reuses shared UniFi configuration but adds Threat Watch specific endpoints
 """
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -9,8 +10,11 @@ from datetime import datetime, timezone
 
 from shared.database import get_db_session
 from shared.models.unifi_config import UniFiConfig
-from shared.crypto import encrypt_password, decrypt_password, encrypt_api_key, decrypt_api_key
+from shared.crypto import encrypt_password, encrypt_api_key
 from shared.unifi_client import UniFiClient
+from shared.unifi_session import (
+    decrypt_client_settings, get_client_settings, invalidate_shared_client
+)
 from tools.threat_watch.models import SuccessResponse
 
 router = APIRouter(prefix="/api/config", tags=["configuration"])
@@ -21,13 +25,14 @@ from pydantic import BaseModel, Field, field_serializer
 from typing import Optional
 
 
+_UTC = timezone.utc
+
+
 def serialize_datetime(dt):
     if dt is None:
         return None
     if dt.tzinfo is not None:
-        from datetime import timezone as tz
-        dt_utc = dt.astimezone(tz.utc)
-        return dt_utc.isoformat().replace('+00:00', 'Z')
+        dt = dt.astimezone(_UTC).replace(tzinfo=None)
     return dt.isoformat() + 'Z'
 
 
@@ -88,8 +93,7 @@ async def save_unifi_config(
     if config.api_key:
         encrypted_api_key = encrypt_api_key(config.api_key)
 
-    result = await db.execute(select(UniFiConfig).where(UniFiConfig.id == 1))
-    existing_config = result.scalar_one_or_none()
+    existing_config = await db.scalar(select(UniFiConfig).where(UniFiConfig.id == 1))
 
     if existing_config:
         existing_config.controller_url = config.controller_url
@@ -112,6 +116,9 @@ async def save_unifi_config(
 
     await db.commit()
 
+    # Drop cached credentials and the shared session so new settings apply
+    await invalidate_shared_client()
+
     return SuccessResponse(
         success=True,
         message="UniFi configuration saved successfully"
@@ -125,8 +132,7 @@ async def get_unifi_config(
     """
     Get current UniFi configuration (without password/API key)
     """
-    result = await db.execute(select(UniFiConfig).where(UniFiConfig.id == 1))
-    config = result.scalar_one_or_none()
+    config = await db.scalar(select(UniFiConfig).where(UniFiConfig.id == 1))
 
     if not config:
         raise HTTPException(
@@ -152,8 +158,7 @@ async def test_unifi_connection(
     """
     Test connection to UniFi controller and check IPS events availability
     """
-    result = await db.execute(select(UniFiConfig).where(UniFiConfig.id == 1))
-    config = result.scalar_one_or_none()
+    config = await db.scalar(select(UniFiConfig).where(UniFiConfig.id == 1))
 
     if not config:
         return UniFiConnectionTest(
@@ -161,87 +166,45 @@ async def test_unifi_connection(
             error="UniFi configuration not found. Please configure your UniFi controller first."
         )
 
-    password = None
-    api_key = None
-
     try:
-        if config.password_encrypted:
-            password = decrypt_password(config.password_encrypted)
-        if config.api_key_encrypted:
-            api_key = decrypt_api_key(config.api_key_encrypted)
+        # Decrypt in a worker thread to keep crypto off the event loop
+        settings = await asyncio.to_thread(decrypt_client_settings, config)
     except Exception as e:
         return UniFiConnectionTest(
             connected=False,
             error=f"Failed to decrypt credentials: {str(e)}"
         )
 
-    client = UniFiClient(
-        host=config.controller_url,
-        username=config.username,
-        password=password,
-        api_key=api_key,
-        site=config.site_id,
-        verify_ssl=config.verify_ssl
-    )
+    client = UniFiClient(**settings)
 
-    test_result = await client.test_connection()
+    # One login covers the controller info and the IPS events probe
+    test_result = await client.test_connection(probe_ips=True)
 
-    # Also test IPS events availability
-    ips_available = False
+    # Update last successful connection time if successful
     if test_result.get("connected"):
-        try:
-            await client.connect()
-            events = await client.get_ips_events(limit=1)
-            ips_available = True  # If we get here without error, IPS is available
-            await client.disconnect()
-        except Exception:
-            ips_available = False
-
         config.last_successful_connection = datetime.now(timezone.utc)
         await db.commit()
 
-    return UniFiConnectionTest(
-        connected=test_result.get("connected", False),
-        client_count=test_result.get("client_count"),
-        ap_count=test_result.get("ap_count"),
-        site=test_result.get("site"),
-        error=test_result.get("error"),
-        ips_events_available=ips_available if test_result.get("connected") else None
-    )
+    return UniFiConnectionTest(**test_result)
 
 
 async def get_unifi_client(db: AsyncSession = Depends(get_db_session)) -> UniFiClient:
     """
     Dependency to get a configured UniFi client instance
     """
-    result = await db.execute(select(UniFiConfig).where(UniFiConfig.id == 1))
-    config = result.scalar_one_or_none()
-
-    if not config:
-        raise HTTPException(
-            status_code=404,
-            detail="UniFi configuration not found. Please configure your UniFi controller first."
-        )
-
-    password = None
-    api_key = None
-
     try:
-        if config.password_encrypted:
-            password = decrypt_password(config.password_encrypted)
-        if config.api_key_encrypted:
-            api_key = decrypt_api_key(config.api_key_encrypted)
+        # Served from memory after the first call; invalidated on config save
+        settings = await get_client_settings(db)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to decrypt UniFi credentials: {str(e)}"
         )
 
-    return UniFiClient(
-        host=config.controller_url,
-        username=config.username,
-        password=password,
-        api_key=api_key,
-        site=config.site_id,
-        verify_ssl=config.verify_ssl
-    )
+    if not settings:
+        raise HTTPException(
+            status_code=404,
+            detail="UniFi configuration not found. Please configure your UniFi controller first."
+        )
+
+    return UniFiClient(**settings)
@@ -1,15 +1,24 @@
 """
 API routes for threat events
 """
+import asyncio
+import base64
+import binascii
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc, and_, or_
+from sqlalchemy import select, func, desc, and_, or_, literal_column, type_coerce, union_all
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from shared.database import get_db_session
-from tools.threat_watch.database import ThreatEvent, ThreatIgnoreRule
+from tools.threat_watch import response_cache
+from tools.threat_watch.database import (
+    ThreatEvent, ThreatIgnoreRule, UTCDateTime, search_index_available, threats_events_search
+)
 
 logger = logging.getLogger(__name__)
 from tools.threat_watch.models import (
@@ -18,6 +27,7 @@ from tools.threat_watch.models import (
     ThreatEventsListResponse,
     ThreatStatsResponse,
     ThreatTimelineResponse,
+    CategoriesResponse,
     SeverityCount,
     CategoryCount,
     CountryCount,
@@ -35,30 +45,65 @@ SEVERITY_LABELS = {
     3: "Low"
 }
 
+# SQLite strftime formats that truncate a stored timestamp to its timeline bucket
+TIMELINE_BUCKET_FORMATS = {
+    "hour": "%Y-%m-%d %H:00:00.000000",
+    "day": "%Y-%m-%d 00:00:00.000000"
+}
 
-@router.get("", response_model=ThreatEventsListResponse)
-async def get_events(
-    start_time: Optional[datetime] = Query(None, description="Filter events after this time"),
-    end_time: Optional[datetime] = Query(None, description="Filter events before this time"),
-    severity: Optional[int] = Query(None, ge=1, le=3, description="Filter by severity (1=high, 2=medium, 3=low)"),
-    category: Optional[str] = Query(None, description="Filter by category"),
-    action: Optional[str] = Query(None, description="Filter by action (alert, block)"),
-    src_ip: Optional[str] = Query(None, description="Filter by source IP"),
-    dest_ip: Optional[str] = Query(None, description="Filter by destination IP"),
-    search: Optional[str] = Query(None, description="Search in signature/message"),
-    include_ignored: bool = Query(False, description="Include events that match ignore rules"),
-    page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(50, ge=1, le=500, description="Events per page"),
-    db: AsyncSession = Depends(get_db_session)
-):
-    """
-    Get paginated list of threat events with optional filtering
+# Trigrams need at least 3 characters; shorter searches fall back to ILIKE
+SEARCH_TRIGRAM_MIN_LENGTH = 3
+
+# Validates a whole page of ORM rows in one pydantic-core call
+_events_adapter = TypeAdapter(List[ThreatEventResponse])
+
+# Rows fetched per round-trip when streaming events
+STREAM_BATCH_SIZE = 500
+
+# Columns needed for ThreatEventResponse; list endpoints select only these so
+# raw_data and other unused columns are never loaded or hydrated
+_RESPONSE_COLUMNS = [getattr(ThreatEvent, name) for name in ThreatEventResponse.model_fields]
+
+# Timestamps load as aware UTC; emit them with a 'Z' suffix like the JSON endpoints
+_NDJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def _not_modified(request: Request, response: Response) -> Optional[Response]:
     """
-    # Build query
-    query = select(ThreatEvent)
-    count_query = select(func.count(ThreatEvent.id))
+    Add ETag/Cache-Control headers to a read-mostly endpoint's response
 
-    # Apply filters
+    The ETag comes from the response cache's data version, so checking it
+    costs no database work. no-cache makes clients revalidate every time
+    (dashboards must see new events immediately) but lets them reuse their
+    copy on a 304.
+
+    Returns:
+        An empty 304 response if the client's copy is current, else None
+    """
+    etag = response_cache.etag()
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
+def _event_filters(
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    severity: Optional[int] = None,
+    category: Optional[str] = None,
+    action: Optional[str] = None,
+    src_ip: Optional[str] = None,
+    dest_ip: Optional[str] = None,
+    search: Optional[str] = None,
+    include_ignored: bool = False
+) -> list:
+    """
+    Build the WHERE clauses shared by the event list endpoints
+    """
     filters = []
 
     # By default, exclude ignored events unless include_ignored is True
@@ -80,170 +125,399 @@ async def get_events(
     if dest_ip:
         filters.append(ThreatEvent.dest_ip == dest_ip)
     if search:
-        search_filter = or_(
-            ThreatEvent.signature.ilike(f"%{search}%"),
-            ThreatEvent.message.ilike(f"%{search}%")
-        )
+        if len(search) >= SEARCH_TRIGRAM_MIN_LENGTH and search_index_available():
+            # Quoted phrase = case-insensitive substring match via the trigram index
+            phrase = '"' + search.replace('"', '""') + '"'
+            search_filter = ThreatEvent.id.in_(
+                select(threats_events_search.c.rowid)
+                .where(literal_column("threats_events_search").op("MATCH")(phrase))
+            )
+        else:
+            search_filter = or_(
+                ThreatEvent.signature.ilike(f"%{search}%"),
+                ThreatEvent.message.ilike(f"%{search}%")
+            )
         filters.append(search_filter)
 
+    return filters
+
+
+def _encode_cursor(timestamp: datetime, event_id: int) -> str:
+    """
+    Encode the position of the last event on a page as an opaque cursor
+    """
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{event_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by _encode_cursor into (timestamp, id)
+    """
+    try:
+        timestamp, event_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(event_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_cursor(cursor: str):
+    """
+    WHERE clause selecting events that sort after the cursor in
+    (timestamp DESC, id DESC) order
+    """
+    cursor_time, cursor_id = _decode_cursor(cursor)
+    return or_(
+        ThreatEvent.timestamp < cursor_time,
+        and_(ThreatEvent.timestamp == cursor_time, ThreatEvent.id < cursor_id)
+    )
+
+
+async def _fetch_page(
+    db: AsyncSession,
+    branches: list,
+    page: int,
+    page_size: int,
+    cursor: Optional[str]
+):
+    """
+    Fetch one page of events, newest first
+
+    With a cursor, seeks past the previous page; without one, falls back to
+    offset pagination by page. One extra row is fetched to detect has_more
+    without counting the whole result set.
+
+    Args:
+        branches: One or more selects of _RESPONSE_COLUMNS with disjoint
+            results; several are combined with UNION ALL
+
+    Returns:
+        Tuple of (events, has_more)
+    """
+    if cursor:
+        after = _after_cursor(cursor)
+        branches = [branch.where(after) for branch in branches]
+
+    query = branches[0] if len(branches) == 1 else union_all(*branches)
+    columns = query.selected_columns
+    query = query.order_by(desc(columns.timestamp), desc(columns.id))
+
+    if not cursor:
+        query = query.offset((page - 1) * page_size)
+
+    result = await db.execute(query.limit(page_size + 1))
+    events = result.all()
+    return events[:page_size], len(events) > page_size
+
+
+def _set_next_link(request: Request, response: Response, next_cursor: Optional[str]):
+    """
+    Advertise the next page as an RFC 8288 Link header, keeping the
+    request's filters and replacing only the cursor
+
+    The reference is relative (path and query only): behind a TLS-terminating
+    reverse proxy the scheme and host seen by the app aren't the public ones.
+    """
+    if next_cursor:
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        response.headers["Link"] = f'<{next_url.path}?{next_url.query}>; rel="next"'
+
+
+async def _cached_total(db: AsyncSession, count_query, cache_key: str) -> int:
+    """
+    Run a COUNT query, reusing the result for the same filters for a short while
+    """
+    total = response_cache.get_cached(cache_key)
+    if total is None:
+        total_result = await db.execute(count_query)
+        total = total_result.scalar()
+        response_cache.set_cached(cache_key, total, response_cache.EVENTS_TOTAL_CACHE_TTL_SECONDS)
+    return total
+
+
+@router.get("", response_model=ThreatEventsListResponse)
+async def get_events(
+    request: Request,
+    response: Response,
+    start_time: Optional[datetime] = Query(None, description="Filter events after this time"),
+    end_time: Optional[datetime] = Query(None, description="Filter events before this time"),
+    severity: Optional[int] = Query(
+        None, ge=1, le=3, description="Filter by severity (1=high, 2=medium, 3=low)"
+    ),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    action: Optional[str] = Query(None, description="Filter by action (alert, block)"),
+    src_ip: Optional[str] = Query(None, description="Filter by source IP"),
+    dest_ip: Optional[str] = Query(None, description="Filter by destination IP"),
+    search: Optional[str] = Query(None, description="Search in signature/message"),
+    include_ignored: bool = Query(False, description="Include events that match ignore rules"),
+    page: int = Query(
+        1, ge=1, description="Page number (legacy offset pagination, ignored with cursor)"
+    ),
+    page_size: int = Query(50, ge=1, le=500, description="Events per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(False, description="Also count all matching events"),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Get paginated list of threat events with optional filtering
+
+    Pass the returned next_cursor as ?cursor= to walk pages with an index
+    range scan; page/offset pagination is kept for compatibility but gets
+    slower the deeper the page.
+    """
+    # Build query
+    query = select(*_RESPONSE_COLUMNS)
+    count_query = select(func.count()).select_from(ThreatEvent)
+
+    # Apply filters
+    filters = _event_filters(
+        start_time, end_time, severity, category, action,
+        src_ip, dest_ip, search, include_ignored
+    )
+
     if filters:
         query = query.where(and_(*filters))
         count_query = count_query.where(and_(*filters))
 
-    # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-
-    # Apply pagination and ordering
-    offset = (page - 1) * page_size
-    query = query.order_by(desc(ThreatEvent.timestamp)).offset(offset).limit(page_size)
-
-    # Execute query
-    result = await db.execute(query)
-    events = result.scalars().all()
+    # Counting every match is the most expensive part of a page request, so
+    # it's opt-in and cached per filter combination
+    total = None
+    if include_total:
+        filter_key = (
+            start_time, end_time, severity, category, action,
+            src_ip, dest_ip, search, include_ignored
+        )
+        total = await _cached_total(db, count_query, f"events_total:{filter_key!r}")
 
-    has_more = (offset + len(events)) < total
+    events, has_more = await _fetch_page(db, [query], page, page_size, cursor)
+    next_cursor = _encode_cursor(events[-1].timestamp, events[-1].id) if has_more else None
+    _set_next_link(request, response, next_cursor)
 
     return ThreatEventsListResponse(
-        events=[ThreatEventResponse.model_validate(e) for e in events],
+        events=_events_adapter.validate_python(events, from_attributes=True),
         total=total,
         page=page,
         page_size=page_size,
-        has_more=has_more
+        has_more=has_more,
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/stream")
+async def stream_events(
+    start_time: Optional[datetime] = Query(None, description="Filter events after this time"),
+    end_time: Optional[datetime] = Query(None, description="Filter events before this time"),
+    severity: Optional[int] = Query(
+        None, ge=1, le=3, description="Filter by severity (1=high, 2=medium, 3=low)"
+    ),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    action: Optional[str] = Query(None, description="Filter by action (alert, block)"),
+    src_ip: Optional[str] = Query(None, description="Filter by source IP"),
+    dest_ip: Optional[str] = Query(None, description="Filter by destination IP"),
+    search: Optional[str] = Query(None, description="Search in signature/message"),
+    include_ignored: bool = Query(False, description="Include events that match ignore rules"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of events"),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Stream threat events as newline-delimited JSON (one event per line)
+
+    Rows are read from the database in batches and written straight to the
+    response, so memory use stays flat regardless of how many events match.
+    Each line has the same fields as the paginated list endpoint.
+    """
+    query = select(*_RESPONSE_COLUMNS)
+
+    filters = _event_filters(
+        start_time, end_time, severity, category, action,
+        src_ip, dest_ip, search, include_ignored
+    )
+    if filters:
+        query = query.where(and_(*filters))
+
+    query = (
+        query.order_by(desc(ThreatEvent.timestamp), desc(ThreatEvent.id))
+        .limit(limit)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
     )
 
+    async def generate():
+        result = await db.stream(query)
+        async for row in result.mappings():
+            yield orjson.dumps(dict(row), option=_NDJSON_OPTIONS) + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 
 @router.get("/stats", response_model=ThreatStatsResponse)
 async def get_stats(
+    request: Request,
+    response: Response,
     include_ignored: bool = Query(False, description="Include ignored events in stats"),
     db: AsyncSession = Depends(get_db_session)
 ):
     """
     Get threat statistics overview
     """
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+
+    # Every open dashboard polls this; identical requests share one result
+    # until it expires or a refresh/ignore rule change invalidates it
+    cache_key = f"stats:{include_ignored}"
+    stats = response_cache.get_cached(cache_key)
+    if stats is not None:
+        return stats
+
     now = datetime.now(timezone.utc)
     day_ago = now - timedelta(days=1)
     week_ago = now - timedelta(days=7)
 
-    # Count of ignored events (always returned)
-    ignored_result = await db.execute(
-        select(func.count(ThreatEvent.id)).where(ThreatEvent.ignored == True)
-    )
-    ignored_count = ignored_result.scalar() or 0
-
     # Base filter - exclude ignored events unless include_ignored is True
     if include_ignored:
         base_filters = []  # No filtering
     else:
         base_filters = [ThreatEvent.ignored == False]
 
-    # Total events
-    total_query = select(func.count(ThreatEvent.id))
-    if base_filters:
-        total_query = total_query.where(*base_filters)
-    total_result = await db.execute(total_query)
-    total_events = total_result.scalar() or 0
-
-    # Events in last 24 hours
-    query_24h = select(func.count(ThreatEvent.id)).where(ThreatEvent.timestamp >= day_ago)
-    if base_filters:
-        query_24h = query_24h.where(*base_filters)
-    result_24h = await db.execute(query_24h)
-    events_24h = result_24h.scalar() or 0
-
-    # Events in last 7 days
-    query_7d = select(func.count(ThreatEvent.id)).where(ThreatEvent.timestamp >= week_ago)
-    if base_filters:
-        query_7d = query_7d.where(*base_filters)
-    result_7d = await db.execute(query_7d)
-    events_7d = result_7d.scalar() or 0
-
-    # Blocked vs Alert counts
-    blocked_query = select(func.count(ThreatEvent.id)).where(ThreatEvent.action == "block")
-    if base_filters:
-        blocked_query = blocked_query.where(*base_filters)
-    blocked_result = await db.execute(blocked_query)
-    blocked_count = blocked_result.scalar() or 0
-
-    alert_query = select(func.count(ThreatEvent.id)).where(ThreatEvent.action == "alert")
-    if base_filters:
-        alert_query = alert_query.where(*base_filters)
-    alert_result = await db.execute(alert_query)
-    alert_count = alert_result.scalar() or 0
+    def filtered_count(*conditions):
+        """COUNT(*) restricted to base_filters plus any extra conditions"""
+        filters = [*base_filters, *conditions]
+        return func.count().filter(and_(*filters)) if filters else func.count()
+
+    # All scalar counts in one pass over the table. The ignored count is
+    # always returned, so it is not restricted by base_filters.
+    counts_query = select(
+        func.count().filter(ThreatEvent.ignored == True).label("ignored"),
+        filtered_count().label("total"),
+        filtered_count(ThreatEvent.timestamp >= day_ago).label("events_24h"),
+        filtered_count(ThreatEvent.timestamp >= week_ago).label("events_7d"),
+        filtered_count(ThreatEvent.action == "block").label("blocked"),
+        filtered_count(ThreatEvent.action == "alert").label("alerts")
+    )
 
     # By severity
     severity_query = (
-        select(ThreatEvent.severity, func.count(ThreatEvent.id))
+        select(ThreatEvent.severity, func.count())
         .where(ThreatEvent.severity.isnot(None))
     )
     if base_filters:
         severity_query = severity_query.where(*base_filters)
     severity_query = severity_query.group_by(ThreatEvent.severity).order_by(ThreatEvent.severity)
-    severity_result = await db.execute(severity_query)
+
+    async def fetch_rows(query):
+        """Run a grouped query on its own session so they can run concurrently"""
+        async with AsyncSession(db.bind) as session:
+            result = await session.execute(query)
+            return result.all()
+
+    # The queries are independent; run them side by side on separate
+    # connections (a single session can't execute statements concurrently)
+    queries = [db.execute(counts_query), fetch_rows(severity_query)]
+
+    # The top-10 breakdowns are the expensive part (full scan + hash
+    # aggregate each) and change slowly, so they are kept in the response
+    # cache until it expires or is invalidated by a refresh/ignore rule
+    top_cache_key = f"stats_top:{include_ignored}"
+    top_lists = response_cache.get_cached(top_cache_key)
+    if top_lists is None:
+        # By category (top 10)
+        category_query = (
+            select(ThreatEvent.category, func.count())
+            .where(ThreatEvent.category.isnot(None))
+        )
+        if base_filters:
+            category_query = category_query.where(*base_filters)
+        category_query = (
+            category_query.group_by(ThreatEvent.category)
+            .order_by(desc(func.count()))
+            .limit(10)
+        )
+
+        # By source country (top 10)
+        country_query = (
+            select(ThreatEvent.src_country, func.count())
+            .where(ThreatEvent.src_country.isnot(None))
+        )
+        if base_filters:
+            country_query = country_query.where(*base_filters)
+        country_query = (
+            country_query.group_by(ThreatEvent.src_country)
+            .order_by(desc(func.count()))
+            .limit(10)
+        )
+
+        # Top attackers (top 10 source IPs)
+        attackers_query = (
+            select(
+                ThreatEvent.src_ip,
+                func.count().label('count'),
+                func.max(ThreatEvent.src_country).label('country'),
+                func.max(ThreatEvent.src_org).label('org'),
+                func.max(ThreatEvent.timestamp).label('last_seen')
+            )
+            .where(ThreatEvent.src_ip.isnot(None))
+        )
+        if base_filters:
+            attackers_query = attackers_query.where(*base_filters)
+        attackers_query = (
+            attackers_query.group_by(ThreatEvent.src_ip)
+            .order_by(desc(func.count()))
+            .limit(10)
+        )
+
+        queries += [
+            fetch_rows(category_query),
+            fetch_rows(country_query),
+            fetch_rows(attackers_query)
+        ]
+
+    counts_result, severity_rows, *top_rows = await asyncio.gather(*queries)
+
+    counts = counts_result.one()
+    ignored_count = counts.ignored
+    total_events = counts.total
+    events_24h = counts.events_24h
+    events_7d = counts.events_7d
+    blocked_count = counts.blocked
+    alert_count = counts.alerts
+
     by_severity = [
         SeverityCount(
             severity=sev,
             label=SEVERITY_LABELS.get(sev, f"Severity {sev}"),
             count=count
         )
-        for sev, count in severity_result.all()
-    ]
-
-    # By category (top 10)
-    category_query = (
-        select(ThreatEvent.category, func.count(ThreatEvent.id))
-        .where(ThreatEvent.category.isnot(None))
-    )
-    if base_filters:
-        category_query = category_query.where(*base_filters)
-    category_query = category_query.group_by(ThreatEvent.category).order_by(desc(func.count(ThreatEvent.id))).limit(10)
-    category_result = await db.execute(category_query)
-    by_category = [
-        CategoryCount(category=cat or "Unknown", count=count)
-        for cat, count in category_result.all()
-    ]
-
-    # By source country (top 10)
-    country_query = (
-        select(ThreatEvent.src_country, func.count(ThreatEvent.id))
-        .where(ThreatEvent.src_country.isnot(None))
-    )
-    if base_filters:
-        country_query = country_query.where(*base_filters)
-    country_query = country_query.group_by(ThreatEvent.src_country).order_by(desc(func.count(ThreatEvent.id))).limit(10)
-    country_result = await db.execute(country_query)
-    by_country = [
-        CountryCount(country=country or "Unknown", country_code=country, count=count)
-        for country, count in country_result.all()
+        for sev, count in severity_rows
     ]
 
-    # Top attackers (top 10 source IPs)
-    attackers_query = (
-        select(
-            ThreatEvent.src_ip,
-            func.count(ThreatEvent.id).label('count'),
-            func.max(ThreatEvent.src_country).label('country'),
-            func.max(ThreatEvent.src_org).label('org'),
-            func.max(ThreatEvent.timestamp).label('last_seen')
-        )
-        .where(ThreatEvent.src_ip.isnot(None))
-    )
-    if base_filters:
-        attackers_query = attackers_query.where(*base_filters)
-    attackers_query = attackers_query.group_by(ThreatEvent.src_ip).order_by(desc(func.count(ThreatEvent.id))).limit(10)
-    attackers_result = await db.execute(attackers_query)
-    top_attackers = [
-        TopAttacker(
-            ip=row.src_ip,
-            count=row.count,
-            country=row.country,
-            org=row.org,
-            last_seen=row.last_seen
+    if top_lists is None:
+        category_rows, country_rows, attacker_rows = top_rows
+        by_category = [
+            CategoryCount(category=cat or "Unknown", count=count)
+            for cat, count in category_rows
+        ]
+        by_country = [
+            CountryCount(country=country or "Unknown", country_code=country, count=count)
+            for country, count in country_rows
+        ]
+        top_attackers = [
+            TopAttacker(
+                ip=row.src_ip,
+                count=row.count,
+                country=row.country,
+                org=row.org,
+                last_seen=row.last_seen
+            )
+            for row in attacker_rows
+        ]
+        top_lists = (by_category, by_country, top_attackers)
+        response_cache.set_cached(
+            top_cache_key, top_lists, response_cache.STATS_TOP_CACHE_TTL_SECONDS
         )
-        for row in attackers_result.all()
-    ]
 
-    return ThreatStatsResponse(
+    by_category, by_country, top_attackers = top_lists
+
+    stats = ThreatStatsResponse(
         total_events=total_events,
         events_24h=events_24h,
         events_7d=events_7d,
@@ -255,10 +529,14 @@ async def get_stats(
         by_country=by_country,
         top_attackers=top_attackers
     )
+    response_cache.set_cached(cache_key, stats, response_cache.STATS_CACHE_TTL_SECONDS)
+    return stats
 
 
 @router.get("/timeline", response_model=ThreatTimelineResponse)
 async def get_timeline(
+    request: Request,
+    response: Response,
     interval: str = Query("hour", pattern="^(hour|day)$", description="Time interval (hour or day)"),
     days: int = Query(7, ge=1, le=30, description="Number of days to include"),
     db: AsyncSession = Depends(get_db_session)
@@ -266,53 +544,69 @@ async def get_timeline(
     """
     Get threat event counts over time for charting
     """
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+
+    cache_key = f"timeline:{interval}:{days}"
+    timeline = response_cache.get_cached(cache_key)
+    if timeline is not None:
+        return timeline
+
     now = datetime.now(timezone.utc)
     start_time = now - timedelta(days=days)
 
-    # Get all events in range
+    # Bucket in SQL so only one row per interval comes back. Timestamps are
+    # stored as naive UTC text, so truncating the string is enough.
+    bucket = type_coerce(
+        func.strftime(TIMELINE_BUCKET_FORMATS[interval], ThreatEvent.timestamp),
+        UTCDateTime()
+    ).label("bucket")
     result = await db.execute(
-        select(ThreatEvent.timestamp)
+        select(bucket, func.count().label("count"))
         .where(ThreatEvent.timestamp >= start_time)
-        .order_by(ThreatEvent.timestamp)
+        .group_by(bucket)
+        .order_by(bucket)
     )
-    timestamps = [row[0] for row in result.all()]
-
-    # Bucket by interval
-    buckets = {}
-    for ts in timestamps:
-        if interval == "hour":
-            bucket = ts.replace(minute=0, second=0, microsecond=0)
-        else:  # day
-            bucket = ts.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        if bucket not in buckets:
-            buckets[bucket] = 0
-        buckets[bucket] += 1
-
-    # Convert to list sorted by time
     data = [
-        TimelinePoint(timestamp=ts, count=count)
-        for ts, count in sorted(buckets.items())
+        TimelinePoint(timestamp=row.bucket, count=row.count)
+        for row in result.all()
     ]
 
-    return ThreatTimelineResponse(interval=interval, data=data)
+    timeline = ThreatTimelineResponse(interval=interval, data=data)
+    response_cache.set_cached(cache_key, timeline, response_cache.TIMELINE_CACHE_TTL_SECONDS)
+    return timeline
 
 
-@router.get("/categories")
+@router.get("/categories", response_model=CategoriesResponse)
 async def get_categories(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db_session)
 ):
     """
     Get list of all threat categories
     """
-    result = await db.execute(
-        select(ThreatEvent.category)
-        .where(ThreatEvent.category.isnot(None))
-        .distinct()
-        .order_by(ThreatEvent.category)
-    )
-    categories = [row[0] for row in result.all()]
-    return {"categories": categories}
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+
+    # The category list rarely changes; serve it from the response cache
+    categories = response_cache.get_cached("categories")
+    if categories is None:
+        result = await db.execute(
+            select(ThreatEvent.category)
+            .where(ThreatEvent.category.isnot(None))
+            .distinct()
+            .order_by(ThreatEvent.category)
+        )
+        categories = [row[0] for row in result.all()]
+        response_cache.set_cached(
+            "categories", categories, response_cache.CATEGORIES_CACHE_TTL_SECONDS
+        )
+
+    return CategoriesResponse(categories=categories)
 
 
 @router.get("/{event_id}", response_model=ThreatEventDetail)
@@ -394,50 +688,50 @@ async def ignore_event_ip(
     return IgnoreRuleResponse.model_validate(new_rule)
 
 
-@router.get("/ip/{ip_address}")
+@router.get("/ip/{ip_address}", response_model=ThreatEventsListResponse)
 async def get_events_by_ip(
+    request: Request,
+    response: Response,
     ip_address: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(False, description="Also count all matching events"),
     db: AsyncSession = Depends(get_db_session)
 ):
     """
     Get all events for a specific IP address (source or destination)
     """
-    # Build query for events where IP is source or destination
-    query = select(ThreatEvent).where(
-        or_(
-            ThreatEvent.src_ip == ip_address,
-            ThreatEvent.dest_ip == ip_address
-        )
+    # Events where IP is source or destination, as two disjoint halves so
+    # each can be read in timestamp order from its (ip, timestamp) index
+    # and merged, instead of collecting every match and sorting it
+    as_source = select(*_RESPONSE_COLUMNS).where(ThreatEvent.src_ip == ip_address)
+    as_destination = select(*_RESPONSE_COLUMNS).where(
+        ThreatEvent.dest_ip == ip_address,
+        or_(ThreatEvent.src_ip.is_(None), ThreatEvent.src_ip != ip_address)
     )
-    count_query = select(func.count(ThreatEvent.id)).where(
+    count_query = select(func.count()).select_from(ThreatEvent).where(
         or_(
             ThreatEvent.src_ip == ip_address,
             ThreatEvent.dest_ip == ip_address
         )
     )
 
-    # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-
-    # Apply pagination and ordering
-    offset = (page - 1) * page_size
-    query = query.order_by(desc(ThreatEvent.timestamp)).offset(offset).limit(page_size)
-
-    # Execute query
-    result = await db.execute(query)
-    events = result.scalars().all()
+    total = None
+    if include_total:
+        total = await _cached_total(db, count_query, f"ip_total:{ip_address}")
 
-    has_more = (offset + len(events)) < total
+    events, has_more = await _fetch_page(db, [as_source, as_destination], page, page_size, cursor)
+    next_cursor = _encode_cursor(events[-1].timestamp, events[-1].id) if has_more else None
+    _set_next_link(request, response, next_cursor)
 
     return ThreatEventsListResponse(
-        events=[ThreatEventResponse.model_validate(e) for e in events],
+        events=_events_adapter.validate_python(events, from_attributes=True),
         total=total,
         page=page,
         page_size=page_size,
-        has_more=has_more
+        has_more=has_more,
+        next_cursor=next_cursor
     )
 
 
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, or_, and_
 
 from shared.database import get_db_session
+from tools.threat_watch import response_cache
 from tools.threat_watch.database import ThreatIgnoreRule, ThreatEvent
 from tools.threat_watch.models import (
     IgnoreRuleCreate,
@@ -164,9 +165,10 @@ async def create_ignore_rule(
 
     # Apply rule to existing events
     if new_rule.enabled:
-        await apply_ignore_rule_to_existing_events(db, new_rule)
-        await db.commit()
-        await db.refresh(new_rule)
+        if await apply_ignore_rule_to_existing_events(db, new_rule):
+            await db.commit()
+            response_cache.invalidate_all()
+            await db.refresh(new_rule)
 
     return IgnoreRuleResponse.model_validate(new_rule)
 
@@ -246,17 +248,18 @@ async def update_ignore_rule(
         )
 
     # First, unmark events that were ignored by this rule
-    await remove_ignore_rule_from_events(db, rule.id)
+    changed = await remove_ignore_rule_from_events(db, rule.id)
     rule.events_ignored = 0
 
-    await db.commit()
-    await db.refresh(rule)
-
     # Re-apply rule to existing events with updated criteria
     if rule.enabled:
-        await apply_ignore_rule_to_existing_events(db, rule)
-        await db.commit()
-        await db.refresh(rule)
+        changed += await apply_ignore_rule_to_existing_events(db, rule)
+
+    await db.commit()
+    # Cached stats and counts must only be dropped once the new flags are visible
+    if changed:
+        response_cache.invalidate_all()
+    await db.refresh(rule)
 
     return IgnoreRuleResponse.model_validate(rule)
 
@@ -286,6 +289,8 @@ async def delete_ignore_rule(
 
     await db.delete(rule)
     await db.commit()
+    if unmarked > 0:
+        response_cache.invalidate_all()
 
     return SuccessResponse(success=True, message=f"Ignore rule for '{ip}' deleted")
 
@@ -3,10 +3,11 @@ Background task scheduler for polling IDS/IPS events
 """
 import json
 import logging
+from collections import Counter
 from datetime import datetime, timezone, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from sqlalchemy import select, func
+from sqlalchemy import insert, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared.database import get_database
@@ -14,7 +15,10 @@ from shared.config import get_settings
 from shared.websocket_manager import get_ws_manager
 from shared.webhooks import deliver_webhook
 from shared.unifi_session import get_shared_client, invalidate_shared_client
-from tools.threat_watch.database import ThreatEvent, ThreatWebhookConfig, ThreatIgnoreRule
+from tools.threat_watch.database import (
+    ThreatEvent, ThreatWebhookConfig, ThreatIgnoreRule, ThreatHourlyCount
+)
+from tools.threat_watch import response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -334,6 +338,73 @@ async def check_ignore_rules(session: AsyncSession, event_data: dict) -> tuple[b
     return False, None
 
 
+def hour_bucket(timestamp: datetime) -> datetime:
+    """
+    Truncate an event timestamp to its hour, as a naive UTC datetime
+
+    Args:
+        timestamp: Event timestamp (naive UTC or timezone-aware)
+
+    Returns:
+        Naive UTC datetime at the start of the hour
+    """
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+async def increment_hourly_counts(session: AsyncSession, counts: Counter):
+    """
+    Add newly stored events to the per-hour event counters
+
+    Args:
+        session: Database session
+        counts: Number of new events per hour bucket
+    """
+    if not counts:
+        return
+
+    result = await session.execute(
+        select(ThreatHourlyCount).where(ThreatHourlyCount.hour_bucket.in_(list(counts)))
+    )
+    existing = {row.hour_bucket: row for row in result.scalars().all()}
+
+    for bucket, count in counts.items():
+        row = existing.get(bucket)
+        if row:
+            row.count += count
+        else:
+            session.add(ThreatHourlyCount(hour_bucket=bucket, count=count))
+
+
+async def backfill_hourly_counts(session: AsyncSession) -> int:
+    """
+    Rebuild the per-hour event counters from threats_events if they are empty
+
+    The migration that adds the counters backfills them, but a database whose
+    migration history was stamped instead of upgraded starts with an empty
+    table, which would make the status totals undercount.
+
+    Args:
+        session: Database session
+
+    Returns:
+        Number of hour buckets written
+    """
+    if await session.scalar(select(ThreatHourlyCount.hour_bucket).limit(1)) is not None:
+        return 0
+
+    bucket = func.strftime('%Y-%m-%d %H:00:00.000000', ThreatEvent.timestamp)
+    result = await session.execute(
+        insert(ThreatHourlyCount).from_select(
+            ["hour_bucket", "count"],
+            select(bucket, func.count()).group_by(bucket)
+        )
+    )
+    await session.commit()
+    return result.rowcount
+
+
 async def refresh_threat_events():
     """
     Background task that polls for new IDS/IPS events
@@ -380,6 +451,7 @@ async def refresh_threat_events():
             # Process and store new events
             new_count = 0
             ignored_count = 0
+            hourly_counts = Counter()
             for raw_event in raw_events:
                 event_data = parse_unifi_event(raw_event)
 
@@ -403,6 +475,7 @@ async def refresh_threat_events():
                 )
                 session.add(new_event)
                 new_count += 1
+                hourly_counts[hour_bucket(event_data['timestamp'])] += 1
 
                 if should_ignore:
                     ignored_count += 1
@@ -412,9 +485,17 @@ async def refresh_threat_events():
                 action = event_data.get('action') or 'alert'
                 await trigger_threat_webhooks(session, event_data, action)
 
+            await increment_hourly_counts(session, hourly_counts)
             await session.commit()
             _last_refresh = datetime.now(timezone.utc)
 
+            if new_count > 0:
+                # Every cached aggregate is stale once new events exist
+                response_cache.invalidate_all()
+            else:
+                # Only the status response carries last_refresh
+                response_cache.invalidate("status")
+
             if new_count > 0:
                 if ignored_count > 0:
                     logger.info(f"Stored {new_count} new threat events ({ignored_count} ignored)")
@@ -440,6 +521,12 @@ async def refresh_threat_events():
 
 async def start_scheduler():
     """Start the background scheduler"""
+    db_instance = get_database()
+    async for session in db_instance.get_session():
+        backfilled = await backfill_hourly_counts(session)
+        if backfilled:
+            logger.info(f"Backfilled threat event counters for {backfilled} hours")
+
     scheduler = get_scheduler()
 
     # Add the refresh job
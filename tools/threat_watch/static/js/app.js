@@ -138,6 +138,7 @@ function dashboard() {
                 const params = new URLSearchParams();
                 params.append('page', this.currentPage);
                 params.append('page_size', this.pageSize);
+                params.append('include_total', 'true');
 
                 if (this.filters.severity) params.append('severity', this.filters.severity);
                 if (this.filters.action) params.append('action', this.filters.action);
@@ -543,13 +544,15 @@ function dashboard() {
 
             try {
                 this.ws = new WebSocket(wsUrl);
+                // Broadcasts arrive as binary frames containing UTF-8 JSON
+                this.ws.binaryType = 'arraybuffer';
 
                 this.ws.onopen = () => {
                     console.log('WebSocket connected');
                 };
 
                 this.ws.onmessage = (event) => {
-                    const data = JSON.parse(event.data);
+                    const data = JSON.parse(typeof event.data === 'string' ? event.data : new TextDecoder().decode(event.data));
                     if (data.type === 'threat_update') {
                         this.showToast(`${data.new_events} new threat events detected`, 'warning');
                         this.loadEvents();
@@ -6,6 +6,8 @@ from typing import Optional, Dict, List
 from datetime import datetime, timezone
 import re
 
+_UTC = timezone.utc
+
 
 def normalize_mac_address(mac: str) -> str:
     """
@@ -42,14 +44,10 @@ def serialize_datetime(dt: Optional[datetime]) -> Optional[str]:
     if dt is None:
         return None
 
-    # If datetime is timezone-aware
+    # Convert aware values to naive UTC so both kinds format the same way
+    # (naive values are assumed to be UTC already), then add 'Z'
     if dt.tzinfo is not None:
-        # Convert to UTC if not already
-        dt_utc = dt.astimezone(timezone.utc)
-        # Return ISO format with 'Z' instead of '+00:00'
-        return dt_utc.isoformat().replace('+00:00', 'Z')
-
-    # If naive, assume it's UTC and add 'Z'
+        dt = dt.astimezone(_UTC).replace(tzinfo=None)
     return dt.isoformat() + 'Z'
 
 
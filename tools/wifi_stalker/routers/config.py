@@ -10,6 +10,7 @@ from shared.database import get_db_session
 from shared.models.unifi_config import UniFiConfig
 from shared.crypto import encrypt_password, decrypt_password, encrypt_api_key, decrypt_api_key
 from shared.unifi_client import UniFiClient
+from shared.unifi_session import get_client_settings, invalidate_shared_client
 from tools.wifi_stalker.models import (
     UniFiConfigCreate,
     UniFiConfigResponse,
@@ -46,8 +47,7 @@ async def save_unifi_config(
         encrypted_api_key = encrypt_api_key(config.api_key)
 
     # Check if config already exists
-    result = await db.execute(select(UniFiConfig).where(UniFiConfig.id == 1))
-    existing_config = result.scalar_one_or_none()
+    existing_config = await db.scalar(select(UniFiConfig).where(UniFiConfig.id == 1))
 
     if existing_config:
         # Update existing config
@@ -72,6 +72,9 @@ async def save_unifi_config(
 
     await db.commit()
 
+    # Drop cached credentials and the shared session so new settings apply
+    await invalidate_shared_client()
+
     return SuccessResponse(
         success=True,
         message="UniFi configuration saved successfully"
@@ -85,8 +88,7 @@ async def get_unifi_config(
     """
     Get current UniFi configuration (without password/API key)
     """
-    result = await db.execute(select(UniFiConfig).where(UniFiConfig.id == 1))
-    config = result.scalar_one_or_none()
+    config = await db.scalar(select(UniFiConfig).where(UniFiConfig.id == 1))
 
     if not config:
         raise HTTPException(
@@ -114,8 +116,7 @@ async def test_unifi_connection(
     Test connection to UniFi controller
     """
     # Get config from database
-    result = await db.execute(select(UniFiConfig).where(UniFiConfig.id == 1))
-    config = result.scalar_one_or_none()
+    config = await db.scalar(select(UniFiConfig).where(UniFiConfig.id == 1))
 
     if not config:
         return UniFiConnectionTest(
@@ -162,37 +163,20 @@ async def get_unifi_client(db: AsyncSession = Depends(get_db_session)) -> UniFiC
     """
     Dependency to get a configured UniFi client instance
     """
-    # Get config from database
-    result = await db.execute(select(UniFiConfig).where(UniFiConfig.id == 1))
-    config = result.scalar_one_or_none()
-
-    if not config:
-        raise HTTPException(
-            status_code=404,
-            detail="UniFi configuration not found. Please configure your UniFi controller first."
-        )
-
-    # Decrypt credentials
-    password = None
-    api_key = None
-
+    # Get decrypted settings (cached in memory, invalidated on config save)
     try:
-        if config.password_encrypted:
-            password = decrypt_password(config.password_encrypted)
-        if config.api_key_encrypted:
-            api_key = decrypt_api_key(config.api_key_encrypted)
+        settings = await get_client_settings(db)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to decrypt UniFi credentials: {str(e)}"
         )
 
+    if not settings:
+        raise HTTPException(
+            status_code=404,
+            detail="UniFi configuration not found. Please configure your UniFi controller first."
+        )
+
     # Create and return UniFi client
-    return UniFiClient(
-        host=config.controller_url,
-        username=config.username,
-        password=password,
-        api_key=api_key,
-        site=config.site_id,
-        verify_ssl=config.verify_ssl
-    )
+    return UniFiClient(**settings)
@@ -141,6 +141,18 @@ def _device_to_dict(device: TrackedDevice) -> dict:
     }
 
 
+async def _broadcast_device(ws_manager, device: TrackedDevice):
+    """
+    Broadcast a device update, skipping serialization when nobody is listening
+
+    Args:
+        ws_manager: WebSocket manager instance
+        device: TrackedDevice instance
+    """
+    if ws_manager.has_connections:
+        await ws_manager.broadcast_device_update(_device_to_dict(device))
+
+
 async def trigger_webhooks(
     session: AsyncSession,
     event_type: str,
@@ -294,7 +306,7 @@ async def process_device(
                     device.current_ap_name = None
 
                     # Broadcast update via WebSocket
-                    await ws_manager.broadcast_device_update(_device_to_dict(device))
+                    await _broadcast_device(ws_manager, device)
 
                     # Trigger roaming webhooks (port changes are like roaming)
                     await trigger_webhooks(session, 'roamed', device)
@@ -337,7 +349,7 @@ async def process_device(
                     device.is_connected = True
 
                     # Broadcast connection event via WebSocket
-                    await ws_manager.broadcast_device_update(_device_to_dict(device))
+                    await _broadcast_device(ws_manager, device)
 
                     # Calculate offline duration for webhook
                     offline_duration = None
@@ -387,7 +399,7 @@ async def process_device(
                     device.current_ap_name = ap_name
 
                     # Broadcast roaming event via WebSocket
-                    await ws_manager.broadcast_device_update(_device_to_dict(device))
+                    await _broadcast_device(ws_manager, device)
 
                     # Trigger roaming webhooks
                     await trigger_webhooks(session, 'roamed', device)
@@ -407,7 +419,7 @@ async def process_device(
             device.is_connected = False
 
             # Broadcast disconnection event via WebSocket
-            await ws_manager.broadcast_device_update(_device_to_dict(device))
+            await _broadcast_device(ws_manager, device)
 
             # Trigger disconnection webhooks
             await trigger_webhooks(session, 'disconnected', device)
@@ -419,7 +431,7 @@ async def process_device(
             logger.info(f"Device {device.mac_address} blocked status changed to {is_blocked}")
             device.is_blocked = is_blocked
             # Broadcast update via WebSocket
-            await ws_manager.broadcast_device_update(_device_to_dict(device))
+            await _broadcast_device(ws_manager, device)
             # Trigger blocked/unblocked webhooks
             event_type = 'blocked' if is_blocked else 'unblocked'
             await trigger_webhooks(session, event_type, device)
@@ -112,6 +112,8 @@ function dashboard() {
             console.log('Connecting to WebSocket:', wsUrl);
 
             this.ws = new WebSocket(wsUrl);
+            // Broadcasts arrive as binary frames containing UTF-8 JSON
+            this.ws.binaryType = 'arraybuffer';
 
             this.ws.onopen = () => {
                 console.log('WebSocket connected');
@@ -119,7 +121,7 @@ function dashboard() {
             };
 
             this.ws.onmessage = (event) => {
-                const data = JSON.parse(event.data);
+                const data = JSON.parse(typeof event.data === 'string' ? event.data : new TextDecoder().decode(event.data));
                 console.log('WebSocket message:', data);
 
                 if (data.type === 'device_update') {